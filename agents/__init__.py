@@ -4,8 +4,22 @@ ERC-8004 Agents Package
 This package contains AI agents that demonstrate the ERC-8004 Trustless Agents standard.
 """
 
-from .base_agent import ERC8004BaseAgent
-from .server_agent import ServerAgent
-from .validator_agent import ValidatorAgent
+import importlib
 
-__all__ = ['ERC8004BaseAgent', 'ServerAgent', 'ValidatorAgent'] 
\ No newline at end of file
+# Exported names -> defining submodule, imported on first access so that
+# importing any agents.* module doesn't load CrewAI (server/validator agents)
+_EXPORTS = {
+    'ERC8004BaseAgent': '.base_agent',
+    'ServerAgent': '.server_agent',
+    'ValidatorAgent': '.validator_agent'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -5,27 +5,46 @@ This module provides the foundational class for agents that interact with
 the ERC-8004 registry contracts.
 """
 
-import json
 import os
-from typing import Dict, Optional, Any
-from web3 import Web3
+from functools import cached_property
+from typing import Dict, List, Optional, Any
 from web3.contract import Contract
 from dotenv import load_dotenv
 
+from .web3_utils import (
+    MULTICALL3_ADDRESS, agent_id_from_receipt, deployment_path, fetch_tx_params, get_web3, load_contract_abi,
+    load_cached_agent_id, load_network_deployment, lookup_registered_agent_id, multicall, send_raw_transaction,
+    store_cached_agent_id, to_checksum_address, wait_for_receipt
+)
+
 load_dotenv()
 
 class ERC8004BaseAgent:
     """Base class for agents interacting with ERC-8004 registries"""
     
-    def __init__(self, agent_domain: str, private_key: str):
+    # Static gas limits per registry method, so writes skip eth_estimateGas
+    GAS_LIMITS = {
+        'newAgent': 250_000,
+        'acceptFeedback': 100_000,
+        'validationRequest': 150_000,
+        'validationResponse': 120_000
+    }
+    
+    def __init__(self, agent_domain: str, private_key: str, check_registration: bool = False,
+                 gas_overrides: Optional[Dict[str, int]] = None):
         """
         Initialize the base agent
         
         Args:
             agent_domain: The domain where this agent's AgentCard is hosted
             private_key: Private key for signing transactions
+            check_registration: Resolve the agent ID during construction instead
+                of on first use (costs one RPC up front)
+            gas_overrides: Per-method gas limits replacing the GAS_LIMITS defaults
         """
         self.agent_domain = agent_domain
+        self._gas_overrides = dict(gas_overrides or {})
+        self.gas_limits = {**self.GAS_LIMITS, **self._gas_overrides}
         self.private_key_override = private_key
         
         # Initialize Web3 connection based on network
@@ -34,17 +53,19 @@ class ERC8004BaseAgent:
             rpc_url = os.getenv('SEPOLIA_RPC_URL')
             private_key = os.getenv('SEPOLIA_PRIVATE_KEY')
             self.chain_id = int(os.getenv('SEPOLIA_CHAIN_ID'))
+            self.ws_url = os.getenv('SEPOLIA_WS_URL')
         else: # default to local
             rpc_url = os.getenv('LOCAL_RPC_URL', 'http://127.0.0.1:8545')
             private_key = os.getenv('LOCAL_PRIVATE_KEY')
             self.chain_id = int(os.getenv('LOCAL_CHAIN_ID', 31337))
+            self.ws_url = os.getenv('LOCAL_WS_URL')
 
         if self.private_key_override:
             private_key = self.private_key_override
 
         self.private_key = private_key
         
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        self.w3 = get_web3(rpc_url)
         
         if not self.w3.is_connected():
             raise ConnectionError(f"Failed to connect to {rpc_url}")
@@ -53,79 +74,193 @@ class ERC8004BaseAgent:
         self.account = self.w3.eth.account.from_key(private_key)
         self.address = self.account.address
         
-        # Load contract addresses from deployment
+        # Load contract addresses from deployment (contract instances are built on first use)
         self._load_contract_addresses()
         
-        # Initialize contract instances
-        self._init_contracts()
-        
-        # Agent registry info
-        self.agent_id: Optional[int] = None
-        self._check_registration()
+        # Agent registry info: from the local cache, else resolved lazily unless requested up front
+        self.agent_id: Optional[int] = load_cached_agent_id(
+            self.agent_domain, self.address, self.network, self.identity_registry_address
+        )
+        self._resolve_cache: Optional[tuple] = None
+        self._next_nonce: Optional[int] = None  # Local nonce counter, resynced on failure
+        if check_registration and not self.agent_id:
+            self._check_registration()
     
     def _load_contract_addresses(self):
         """Load contract addresses from deployment file."""
-        deployment_file = f'deployments/{self.network}.json'
-        if not os.path.exists(deployment_file):
-             # Fallback to root deployment.json for backwards compatibility with original demo
-            deployment_file = 'deployment.json'
+        network = self.network
+        if not os.path.exists(deployment_path(network)):
+            # Fallback to root deployment.json for backwards compatibility with original demo
+            network = 'local'
 
         try:
-            with open(deployment_file, 'r') as f:
-                deployment = json.load(f)
-                contracts = deployment['contracts']
-                
-                self.identity_registry_address = self.w3.to_checksum_address(contracts['identity_registry'])
-                self.reputation_registry_address = self.w3.to_checksum_address(contracts['reputation_registry'])
-                self.validation_registry_address = self.w3.to_checksum_address(contracts['validation_registry'])
+            deployment = load_network_deployment(network)
+            contracts = deployment['contracts']
+            
+            self.identity_registry_address = to_checksum_address(contracts['identity_registry'])
+            self.reputation_registry_address = to_checksum_address(contracts['reputation_registry'])
+            self.validation_registry_address = to_checksum_address(contracts['validation_registry'])
+            self.multicall3_address = to_checksum_address(contracts.get('multicall3', MULTICALL3_ADDRESS))
         except FileNotFoundError:
             raise FileNotFoundError(
-                f"{deployment_file} not found. Please ensure deployments are available."
+                f"{deployment_path(network)} not found. Please ensure deployments are available."
             )
     
-    def _load_contract_abi(self, contract_name: str) -> list:
-        """Load contract ABI from compiled artifacts"""
+    def _load_contract_abi(self, contract_name: str) -> tuple:
+        """Load contract ABI from compiled artifacts (cached per process)"""
         abi_path = f"contracts/out/{contract_name}.sol/{contract_name}.json"
-        
-        with open(abi_path, 'r') as f:
-            artifact = json.load(f)
-            return artifact['abi']
+        return load_contract_abi(abi_path)
     
-    def _init_contracts(self):
-        """Initialize contract instances"""
-        # Load ABIs
-        identity_abi = self._load_contract_abi('IdentityRegistry')
-        reputation_abi = self._load_contract_abi('ReputationRegistry')
-        validation_abi = self._load_contract_abi('ValidationRegistry')
-        
-        # Create contract instances
-        self.identity_registry = self.w3.eth.contract(
+    @cached_property
+    def identity_registry(self) -> Contract:
+        """IdentityRegistry contract instance, built on first access"""
+        return self.w3.eth.contract(
             address=self.identity_registry_address,
-            abi=identity_abi
+            abi=self._load_contract_abi('IdentityRegistry')
         )
-        
-        self.reputation_registry = self.w3.eth.contract(
+    
+    @cached_property
+    def _agent_registered_event(self):
+        """AgentRegistered event instance, built once and reused for every receipt"""
+        return self.identity_registry.events.AgentRegistered()
+    
+    @cached_property
+    def reputation_registry(self) -> Contract:
+        """ReputationRegistry contract instance, built on first access"""
+        return self.w3.eth.contract(
             address=self.reputation_registry_address,
-            abi=reputation_abi
+            abi=self._load_contract_abi('ReputationRegistry')
         )
-        
-        self.validation_registry = self.w3.eth.contract(
+    
+    @cached_property
+    def validation_registry(self) -> Contract:
+        """ValidationRegistry contract instance, built on first access"""
+        return self.w3.eth.contract(
             address=self.validation_registry_address,
-            abi=validation_abi
+            abi=self._load_contract_abi('ValidationRegistry')
+        )
+    
+    @cached_property
+    def _fn_accept_feedback(self):
+        """ReputationRegistry.acceptFeedback, resolved once so each call only binds arguments"""
+        return self.reputation_registry.functions.acceptFeedback
+    
+    @cached_property
+    def _fn_validation_request(self):
+        """ValidationRegistry.validationRequest, resolved once"""
+        return self.validation_registry.functions.validationRequest
+    
+    @cached_property
+    def _fn_validation_response(self):
+        """ValidationRegistry.validationResponse, resolved once"""
+        return self.validation_registry.functions.validationResponse
+    
+    def _resolve_by_address(self) -> tuple:
+        """Resolve this agent's registry entry by address, querying the chain once"""
+        if self._resolve_cache is None:
+            self._resolve_cache = tuple(self.identity_registry.functions.resolveByAddress(self.address).call())
+        return self._resolve_cache
+    
+    def _set_agent_id(self, agent_id: int):
+        """Record the agent ID and persist it so restarts skip resolveByAddress"""
+        self.agent_id = agent_id
+        store_cached_agent_id(
+            self.agent_domain, self.address, self.network, self.identity_registry_address, agent_id
         )
     
     def _check_registration(self):
         """Check if this agent is already registered"""
         try:
-            result = self.identity_registry.functions.resolveByAddress(self.address).call()
+            result = self._resolve_by_address()
             if result[0] > 0:  # AgentID > 0 means registered
-                self.agent_id = result[0]
+                self._set_agent_id(result[0])
                 print(f"✅ Agent already registered with ID: {self.agent_id}")
             else:
                 print("ℹ️  Agent not yet registered")
         except Exception as e:
             print(f"ℹ️  Agent not yet registered: {e}")
     
+    def _require_registration(self) -> int:
+        """Return this agent's ID, resolving it on first use; raise if unregistered"""
+        if not self.agent_id and self._resolve_cache is None:
+            self._check_registration()
+        if not self.agent_id:
+            raise ValueError("Agent must be registered first")
+        return self.agent_id
+    
+    def _gas_limit(self, method: str) -> Optional[int]:
+        """
+        Gas limit for a registry method
+        
+        Returns:
+            The configured limit, or None to estimate; estimation is only used
+            on the local dev chain for methods without an explicit override
+        """
+        if self.network == 'local' and method not in self._gas_overrides:
+            return None
+        return self.gas_limits[method]
+    
+    def _build_tx(self, function, gas: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Build a transaction for a contract call
+        
+        Gas price, nonce and (when no fixed gas limit is given) the gas
+        estimate are fetched together in a single JSON-RPC batch.
+        
+        Args:
+            function: Bound contract function to build the transaction for
+            gas: Fixed gas limit; estimated with a 20% buffer when omitted
+            
+        Returns:
+            Transaction dict ready for signing
+        """
+        gas_price, nonce, gas_estimate = fetch_tx_params(
+            self.w3, self.address, function if gas is None else None, self._next_nonce
+        )
+        if gas is None:
+            gas = int(gas_estimate * 1.2)
+        
+        return function.build_transaction({
+            'from': self.address,
+            'gas': gas,
+            'gasPrice': gas_price,
+            'nonce': nonce,
+            'chainId': self.chain_id,
+        })
+    
+    def _sign_and_send(self, transaction: Dict[str, Any]):
+        """
+        Sign a transaction with the agent's key and broadcast it
+        
+        On success the local nonce counter advances, so the next transaction
+        is built without an eth_getTransactionCount round trip.
+        
+        Returns:
+            Transaction hash
+        """
+        try:
+            signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key=self.private_key)
+            tx_hash = send_raw_transaction(self.w3, signed_txn.raw_transaction)
+        except Exception:
+            self._next_nonce = None
+            raise
+        
+        self._next_nonce = transaction['nonce'] + 1
+        return tx_hash
+    
+    def _wait_for_receipt(self, tx_hash):
+        """Wait for a receipt, via newHeads subscription when a WS URL is configured"""
+        try:
+            receipt = wait_for_receipt(self.w3, tx_hash, self.ws_url)
+        except Exception:
+            self._next_nonce = None
+            raise
+        
+        if receipt.status != 1:
+            # Resync from the node rather than trusting the local counter
+            self._next_nonce = None
+        return receipt
+    
     def register_agent(self) -> int:
         """
         Register this agent with the IdentityRegistry
@@ -133,6 +268,8 @@ class ERC8004BaseAgent:
         Returns:
             Agent ID assigned by the registry
         """
+        if not self.agent_id:
+            self._check_registration()
         if self.agent_id:
             print(f"Agent already registered with ID: {self.agent_id}")
             return self.agent_id
@@ -145,25 +282,16 @@ class ERC8004BaseAgent:
             self.address
         )
         
-        # Estimate gas
-        gas_estimate = function.estimate_gas({'from': self.address})
-        
-        # Build transaction
-        transaction = function.build_transaction({
-            'from': self.address,
-            'gas': int(gas_estimate * 1.2),
-            'gasPrice': self.w3.eth.gas_price,
-            'nonce': self.w3.eth.get_transaction_count(self.address),
-        })
+        # Build transaction (static gas limit; estimated on local)
+        transaction = self._build_tx(function, gas=self._gas_limit('newAgent'))
         
         # Sign and send
-        signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key=self.private_key)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+        tx_hash = self._sign_and_send(transaction)
         
         print(f"   Transaction hash: {tx_hash.hex()}")
         
         # Wait for confirmation
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = self._wait_for_receipt(tx_hash)
         
         if receipt.status == 1:
             # Try multiple approaches to get the agent ID
@@ -171,33 +299,23 @@ class ERC8004BaseAgent:
             
             # Approach 1: Parse event logs
             try:
-                logs = self.identity_registry.events.AgentRegistered().process_receipt(receipt)
-                if logs and len(logs) > 0:
-                    agent_id = logs[0]['args']['agentId']
+                agent_id = agent_id_from_receipt(self._agent_registered_event, receipt)
+                if agent_id is not None:
                     print(f"✅ Agent registered successfully with ID: {agent_id} (from events)")
             except Exception as e:
                 print(f"⚠️  Could not parse event logs: {e}")
             
-            # Approach 2: Query by address (fallback with retry)
+            # Approach 2: block logs and resolveByAddress in a single batch
             if agent_id is None:
-                import time
-                for attempt in range(3):  # Retry up to 3 times
-                    try:
-                        # Small delay to allow blockchain state to settle
-                        if attempt > 0:
-                            time.sleep(0.5)
-                        
-                        agent_info = self.identity_registry.functions.resolveByAddress(self.address).call()
-                        if agent_info[0] > 0:  # agentId > 0 means found
-                            agent_id = agent_info[0]
-                            print(f"✅ Agent registered successfully with ID: {agent_id} (from query)")
-                            break
-                    except Exception as e:
-                        if attempt == 2:  # Last attempt
-                            print(f"⚠️  Could not resolve agent by address: {e}")
+                try:
+                    agent_id = lookup_registered_agent_id(self.identity_registry, self.address, receipt.blockHash)
+                    if agent_id is not None:
+                        print(f"✅ Agent registered successfully with ID: {agent_id} (from query)")
+                except Exception as e:
+                    print(f"⚠️  Could not resolve agent by address: {e}")
             
             if agent_id is not None:
-                self.agent_id = agent_id
+                self._set_agent_id(agent_id)
                 return self.agent_id
             else:
                 raise Exception("Registration succeeded but couldn't determine agent ID")
@@ -214,30 +332,23 @@ class ERC8004BaseAgent:
         Returns:
             Transaction hash
         """
-        if not self.agent_id:
-            raise ValueError("Agent must be registered first")
+        self._require_registration()
         
         print(f"🔐 Authorizing feedback from client agent {client_agent_id}")
         
-        function = self.reputation_registry.functions.acceptFeedback(
+        function = self._fn_accept_feedback(
             client_agent_id,
             self.agent_id
         )
         
         # Build and send transaction
-        transaction = function.build_transaction({
-            'from': self.address,
-            'gas': 100000,
-            'gasPrice': self.w3.eth.gas_price,
-            'nonce': self.w3.eth.get_transaction_count(self.address),
-        })
+        transaction = self._build_tx(function, gas=self._gas_limit('acceptFeedback'))
         
         try:
-            signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key=self.private_key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+            tx_hash = self._sign_and_send(transaction)
             
             print(f"   Transaction hash: {tx_hash.hex()}")
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = self._wait_for_receipt(tx_hash)
             
             if receipt.status == 1:
                 print(f"✅ Feedback authorization successful")
@@ -260,29 +371,22 @@ class ERC8004BaseAgent:
         Returns:
             Transaction hash
         """
-        if not self.agent_id:
-            raise ValueError("Agent must be registered first")
+        self._require_registration()
         
         print(f"🔍 Requesting validation from agent {validator_agent_id}")
         
-        function = self.validation_registry.functions.validationRequest(
+        function = self._fn_validation_request(
             validator_agent_id,
             self.agent_id,
             data_hash
         )
         
         # Build and send transaction
-        transaction = function.build_transaction({
-            'from': self.address,
-            'gas': 150000,
-            'gasPrice': self.w3.eth.gas_price,
-            'nonce': self.w3.eth.get_transaction_count(self.address),
-        })
+        transaction = self._build_tx(function, gas=self._gas_limit('validationRequest'))
         
-        signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key=self.private_key)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+        tx_hash = self._sign_and_send(transaction)
         
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = self._wait_for_receipt(tx_hash)
         
         if receipt.status == 1:
             print(f"✅ Validation request successful")
@@ -301,28 +405,21 @@ class ERC8004BaseAgent:
         Returns:
             Transaction hash
         """
-        if not self.agent_id:
-            raise ValueError("Agent must be registered first")
+        self._require_registration()
         
         print(f"📊 Submitting validation response: {response}/100")
         
-        function = self.validation_registry.functions.validationResponse(
+        function = self._fn_validation_response(
             data_hash,
             response
         )
         
         # Build and send transaction
-        transaction = function.build_transaction({
-            'from': self.address,
-            'gas': 120000,
-            'gasPrice': self.w3.eth.gas_price,
-            'nonce': self.w3.eth.get_transaction_count(self.address),
-        })
+        transaction = self._build_tx(function, gas=self._gas_limit('validationResponse'))
         
-        signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key=self.private_key)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
+        tx_hash = self._sign_and_send(transaction)
         
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = self._wait_for_receipt(tx_hash)
         
         if receipt.status == 1:
             print(f"✅ Validation response submitted successfully")
@@ -337,4 +434,28 @@ class ERC8004BaseAgent:
             'agent_id': result[0],
             'agent_domain': result[1],
             'agent_address': result[2]
-        } 
\ No newline at end of file
+        }
+    
+    def get_agents_info(self, agent_ids: List[int]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get information about several agents in a single Multicall3 eth_call
+        
+        Args:
+            agent_ids: Registry IDs to look up
+            
+        Returns:
+            One info dict per ID, in order; None for IDs that don't resolve
+        """
+        results = multicall(
+            self.w3,
+            [self.identity_registry.functions.getAgent(agent_id) for agent_id in agent_ids],
+            self.multicall3_address
+        )
+        return [
+            {
+                'agent_id': result[0],
+                'agent_domain': result[1],
+                'agent_address': result[2]
+            } if result else None
+            for result in results
+        ] 
\ No newline at end of file
@@ -5,21 +5,59 @@ This module provides the foundational class for agents that interact with
 the ERC-8004 registry contracts using Coinbase AgentKit wallets.
 """
 
+import asyncio
+import hashlib
 import json
 import os
-import time
-from typing import Dict, Optional, Any, Tuple
+from functools import cached_property, lru_cache
+from typing import Dict, List, Optional, Any, Tuple
 from web3 import Web3
 from web3.contract import Contract
 from dotenv import load_dotenv
-from rich import print as rprint
+
+from .web3_utils import (
+    DEPLOYMENT_FILES, MULTICALL3_ADDRESS, agent_id_from_receipt, deployment_path, fetch_tx_params,
+    is_nonce_error, load_cached_agent_id, load_contract_abi, load_network_deployment, lookup_registered_agent_id,
+    multicall, providers, raw_transaction, send_raw_transaction, store_cached_agent_id, wait_for_receipt
+)
+from .log_utils import get_logger
+
+try:
+    import blake3
+except ImportError:  # optional; only needed for agents created with use_blake3=True
+    blake3 = None
 
 load_dotenv()
 
+log = get_logger(__name__)
+
+
+@lru_cache(maxsize=1024)
+def _cid_hash(cid: str) -> str:
+    """SHA-256 of a CID as a 0x-prefixed bytes32 hex string"""
+    return "0x" + hashlib.sha256(cid.encode()).hexdigest()
+
+
+@lru_cache(maxsize=1024)
+def _cid_hash_blake3(cid: str) -> str:
+    """BLAKE3 (32-byte output) of a CID as a 0x-prefixed bytes32 hex string"""
+    return "0x" + blake3.blake3(cid.encode('ascii')).hexdigest(length=32)
+
+
 class GenesisBaseAgent:
     """Base class for Genesis Studio agents interacting with ERC-8004 registries"""
     
-    def __init__(self, agent_domain: str, wallet_address: str, wallet_manager=None):
+    # Static gas limits per registry method, so writes skip eth_estimateGas
+    GAS_LIMITS = {
+        'newAgent': 250_000,
+        'acceptFeedback': 150_000,
+        'validationRequest': 150_000,
+        'validationResponse': 150_000
+    }
+    
+    def __init__(self, agent_domain: str, wallet_address: str, wallet_manager=None,
+                 gas_overrides: Optional[Dict[str, int]] = None, w3: Optional[Web3] = None,
+                 use_blake3: bool = False):
         """
         Initialize the Genesis base agent
         
@@ -27,117 +65,238 @@ class GenesisBaseAgent:
             agent_domain: The domain where this agent's AgentCard is hosted
             wallet_address: The agent's wallet address (from Coinbase AgentKit)
             wallet_manager: Reference to the GenesisWalletManager instance
+            gas_overrides: Per-method gas limits replacing the GAS_LIMITS defaults
+            w3: Web3 instance to use; defaults to the shared instance for the network
+            use_blake3: Derive CID hashes with BLAKE3 instead of SHA-256; every agent
+                exchanging those hashes (server and validator) must use the same setting
         """
+        if use_blake3 and blake3 is None:
+            raise ImportError("use_blake3=True requires the blake3 package (pip install blake3)")
+        self._cid_hasher = _cid_hash_blake3 if use_blake3 else _cid_hash
+        
         self.agent_domain = agent_domain
+        self._gas_overrides = dict(gas_overrides or {})
+        self.gas_limits = {**self.GAS_LIMITS, **self._gas_overrides}
         self.address = wallet_address
         self.wallet_manager = wallet_manager
         self.agent_id = None
         
+        # Resolve the wallet name once; alice.chaoschain-genesis-studio.com -> Alice
+        domain = agent_domain.lower()
+        self._agent_name = next((name for name in ('Alice', 'Bob', 'Charlie') if name.lower() in domain), 'Unknown')
+        self._wallet = wallet_manager.wallets.get(self._agent_name) if wallet_manager else None
+        
+        self._resolve_cache: Optional[tuple] = None
+        
         # Initialize Web3 connection based on network
         self.network = os.getenv('NETWORK', 'base-sepolia')
-        self._setup_web3_connection()
+        self._setup_web3_connection(w3)
         
-        # Load contract addresses and ABIs
+        # Load contract addresses; contract instances are built on first use
         self._load_contract_addresses()
-        self._load_contracts()
+        log.info("📋 Contracts loaded for %s", self.network)
+        
+        # Reuse an agent ID resolved by a previous run
+        self.agent_id = load_cached_agent_id(
+            self.agent_domain, self.address, self.network, self.identity_registry_address
+        )
     
-    def _setup_web3_connection(self):
+    def _setup_web3_connection(self, w3: Optional[Web3] = None):
         """Setup Web3 connection based on configured network"""
         
         if self.network == 'sepolia':
-            rpc_url = os.getenv('SEPOLIA_RPC_URL')
             self.chain_id = int(os.getenv('SEPOLIA_CHAIN_ID', 11155111))
+            self.ws_url = os.getenv('SEPOLIA_WS_URL')
         elif self.network == 'base-sepolia':
-            rpc_url = os.getenv('BASE_SEPOLIA_RPC_URL')
             self.chain_id = int(os.getenv('BASE_SEPOLIA_CHAIN_ID', 84532))
+            self.ws_url = os.getenv('BASE_SEPOLIA_WS_URL')
         elif self.network == 'optimism-sepolia':
-            rpc_url = os.getenv('OPTIMISM_SEPOLIA_RPC_URL')
             self.chain_id = int(os.getenv('OPTIMISM_SEPOLIA_CHAIN_ID', 11155420))
+            self.ws_url = os.getenv('OPTIMISM_SEPOLIA_WS_URL')
         else:  # local
-            rpc_url = os.getenv('LOCAL_RPC_URL', 'http://127.0.0.1:8545')
             self.chain_id = int(os.getenv('LOCAL_CHAIN_ID', 31337))
+            self.ws_url = os.getenv('LOCAL_WS_URL')
         
-        if not rpc_url:
-            raise ValueError(f"RPC URL not configured for network: {self.network}")
-        
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        # Shared per-endpoint instance; raises if the network has no RPC URL
+        self.w3 = w3 or providers.get(self.network)
         
         if not self.w3.is_connected():
-            raise ConnectionError(f"Failed to connect to {rpc_url}")
+            raise ConnectionError(f"Failed to connect to {providers.rpc_url(self.network)}")
         
-        rprint(f"[green]🌐 Connected to {self.network} (Chain ID: {self.chain_id})[/green]")
+        log.info("🌐 Connected to %s (Chain ID: %s)", self.network, self.chain_id)
     
     def _load_contract_addresses(self):
         """Load contract addresses from deployment files"""
         
-        # Map network names to deployment files
-        deployment_files = {
-            'local': 'deployment.json',
-            'sepolia': 'deployments/sepolia.json',
-            'base-sepolia': 'deployments/base-sepolia.json',
-            'optimism-sepolia': 'deployments/optimism-sepolia.json'
-        }
-        
-        deployment_file = deployment_files.get(self.network)
-        if not deployment_file:
+        if self.network not in DEPLOYMENT_FILES:
             raise ValueError(f"No deployment file configured for network: {self.network}")
         
-        deployment_path = os.path.join(os.path.dirname(__file__), '..', deployment_file)
-        
         try:
-            with open(deployment_path, 'r') as f:
-                deployment_data = json.load(f)
+            deployment_data = load_network_deployment(self.network)
             
             contracts = deployment_data.get('contracts', {})
             self.identity_registry_address = contracts.get('identity_registry')
             self.reputation_registry_address = contracts.get('reputation_registry')
             self.validation_registry_address = contracts.get('validation_registry')
+            self.multicall3_address = contracts.get('multicall3', MULTICALL3_ADDRESS)
             
             if not all([self.identity_registry_address, self.reputation_registry_address, self.validation_registry_address]):
                 raise ValueError("Missing contract addresses in deployment file")
                 
         except FileNotFoundError:
-            raise FileNotFoundError(f"Deployment file not found: {deployment_path}")
+            raise FileNotFoundError(f"Deployment file not found: {deployment_path(self.network)}")
         except json.JSONDecodeError:
-            raise ValueError(f"Invalid JSON in deployment file: {deployment_path}")
+            raise ValueError(f"Invalid JSON in deployment file: {deployment_path(self.network)}")
     
-    def _load_contracts(self):
-        """Load contract instances with ABIs"""
-        
-        # Load ABIs from compiled contracts
-        contracts_dir = os.path.join(os.path.dirname(__file__), '..', 'contracts', 'out')
-        
-        # Load Identity Registry
-        identity_abi_path = os.path.join(contracts_dir, 'IdentityRegistry.sol', 'IdentityRegistry.json')
-        with open(identity_abi_path, 'r') as f:
-            identity_artifact = json.load(f)
-        
-        self.identity_registry = self.w3.eth.contract(
-            address=self.identity_registry_address,
-            abi=identity_artifact['abi']
+    def _load_contract(self, contract_name: str, address: str) -> Contract:
+        """Build a contract instance from its compiled ABI"""
+        abi_path = os.path.join(
+            os.path.dirname(__file__), '..', 'contracts', 'out', f'{contract_name}.sol', f'{contract_name}.json'
+        )
+        return self.w3.eth.contract(address=address, abi=load_contract_abi(abi_path))
+    
+    @cached_property
+    def identity_registry(self) -> Contract:
+        """IdentityRegistry contract instance, built on first access"""
+        return self._load_contract('IdentityRegistry', self.identity_registry_address)
+    
+    @cached_property
+    def _agent_registered_event(self):
+        """AgentRegistered event instance, built once and reused for every receipt"""
+        return self.identity_registry.events.AgentRegistered()
+    
+    @cached_property
+    def reputation_registry(self) -> Contract:
+        """ReputationRegistry contract instance, built on first access"""
+        return self._load_contract('ReputationRegistry', self.reputation_registry_address)
+    
+    @cached_property
+    def validation_registry(self) -> Contract:
+        """ValidationRegistry contract instance, built on first access"""
+        return self._load_contract('ValidationRegistry', self.validation_registry_address)
+    
+    @cached_property
+    def _fn_accept_feedback(self):
+        """ReputationRegistry.acceptFeedback, resolved once so each call only binds arguments"""
+        return self.reputation_registry.functions.acceptFeedback
+    
+    @cached_property
+    def _fn_validation_request(self):
+        """ValidationRegistry.validationRequest, resolved once"""
+        return self.validation_registry.functions.validationRequest
+    
+    @cached_property
+    def _fn_validation_response(self):
+        """ValidationRegistry.validationResponse, resolved once"""
+        return self.validation_registry.functions.validationResponse
+    
+    def _resolve_by_address(self) -> tuple:
+        """Resolve this agent's registry entry by address, querying the chain once"""
+        if self._resolve_cache is None:
+            self._resolve_cache = tuple(self.identity_registry.functions.resolveByAddress(self.address).call())
+        return self._resolve_cache
+    
+    def _set_agent_id(self, agent_id: int):
+        """Record the agent ID and persist it so restarts skip resolveByAddress"""
+        self.agent_id = agent_id
+        store_cached_agent_id(
+            self.agent_domain, self.address, self.network, self.identity_registry_address, agent_id
         )
+    
+    def _gas_limit(self, method: str) -> Optional[int]:
+        """
+        Gas limit for a registry method
+        
+        Returns:
+            The configured limit, or None to estimate; estimation is only used
+            on the local dev chain for methods without an explicit override
+        """
+        if self.network == 'local' and method not in self._gas_overrides:
+            return None
+        return self.gas_limits[method]
+    
+    def _build_tx(self, contract_call, gas: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Build a transaction for a contract call
         
-        # Load Reputation Registry
-        reputation_abi_path = os.path.join(contracts_dir, 'ReputationRegistry.sol', 'ReputationRegistry.json')
-        with open(reputation_abi_path, 'r') as f:
-            reputation_artifact = json.load(f)
+        Gas price, nonce and (when no fixed gas limit is given) the gas
+        estimate are fetched together in a single JSON-RPC batch. The nonce
+        is tracked by the wallet manager, per address, so it stays in step
+        with transfers the manager sends from the same wallet.
         
-        self.reputation_registry = self.w3.eth.contract(
-            address=self.reputation_registry_address,
-            abi=reputation_artifact['abi']
+        Args:
+            contract_call: Bound contract function to build the transaction for
+            gas: Fixed gas limit; estimated with a 20% buffer when omitted
+            
+        Returns:
+            Transaction dict ready for signing
+        """
+        gas_price, nonce, gas_estimate = fetch_tx_params(
+            self.w3, self.address, contract_call if gas is None else None,
+            self.wallet_manager.tracked_nonce(self.address)
         )
+        if gas is None:
+            gas = int(gas_estimate * 1.2)  # Add 20% buffer
+            log.debug("⛽ Gas estimate: %s, using limit: %s", gas_estimate, gas)
+        
+        transaction = dict(self._tx_template)
+        transaction['gas'] = gas
+        transaction['gasPrice'] = gas_price
+        transaction['nonce'] = self.wallet_manager.claim_nonce(self.address, nonce)
+        try:
+            return contract_call.build_transaction(transaction)
+        except Exception:
+            self.wallet_manager.reset_nonce(self.address)
+            raise
+    
+    @cached_property
+    def _tx_template(self) -> Dict[str, Any]:
+        """Transaction fields that are fixed for this agent (sender and chain)"""
+        return {'from': self.address, 'chainId': self.chain_id}
+    
+    def _sign_and_send(self, wallet, transaction: Dict[str, Any]):
+        """
+        Sign a transaction built by _build_tx with the agent's wallet and broadcast it
         
-        # Load Validation Registry
-        validation_abi_path = os.path.join(contracts_dir, 'ValidationRegistry.sol', 'ValidationRegistry.json')
-        with open(validation_abi_path, 'r') as f:
-            validation_artifact = json.load(f)
+        If the node reports the nonce as taken (e.g. by a send from another
+        process), the transaction is re-signed once at the pending nonce. On
+        any other failure the tracked nonce is dropped and resynced from the
+        node next time.
         
-        self.validation_registry = self.w3.eth.contract(
-            address=self.validation_registry_address,
-            abi=validation_artifact['abi']
+        Returns:
+            Transaction hash
+        """
+        try:
+            return send_raw_transaction(self.w3, raw_transaction(wallet.sign_transaction(transaction)))
+        except Exception as e:
+            if not is_nonce_error(e):
+                self.wallet_manager.reset_nonce(self.address)
+                raise
+        
+        # send_raw_transaction ruled out our own copy, so this can't duplicate it
+        self.wallet_manager.reset_nonce(self.address)
+        transaction = dict(transaction)
+        transaction['nonce'] = self.wallet_manager.claim_nonce(
+            self.address, self.w3.eth.get_transaction_count(self.address, 'pending')
         )
+        try:
+            return send_raw_transaction(self.w3, raw_transaction(wallet.sign_transaction(transaction)))
+        except Exception:
+            self.wallet_manager.reset_nonce(self.address)
+            raise
+    
+    def _wait_for_receipt(self, tx_hash):
+        """Wait for a receipt, via newHeads subscription when a WS URL is configured"""
+        try:
+            receipt = wait_for_receipt(self.w3, tx_hash, self.ws_url)
+        except Exception:
+            self.wallet_manager.reset_nonce(self.address)
+            raise
         
-        rprint(f"[blue]📋 Contracts loaded for {self.network}[/blue]")
+        if receipt.status != 1:
+            # Resync from the node rather than trusting the local counter
+            self.wallet_manager.reset_nonce(self.address)
+        return receipt
     
     def register_agent(self) -> Tuple[int, str]:
         """
@@ -147,18 +306,40 @@ class GenesisBaseAgent:
             Tuple of (agent_id, transaction_hash)
         """
         
-        rprint(f"[yellow]🔧 Registering agent: {self.agent_domain}[/yellow]")
+        tx_hash = self.build_and_send_registration()
+        if tx_hash is None:
+            return self.agent_id, "already_registered"
+        
+        return self.await_registration(tx_hash)
+    
+    def build_and_send_registration(self):
+        """
+        Build, sign and broadcast the registration transaction without waiting
+        
+        Agents have independent nonces, so several agents can send their
+        registrations back to back and then await them together; the
+        transactions land in the same block instead of one block each.
+        
+        Returns:
+            Transaction hash, or None if the agent is already registered
+        """
+        
+        log.info("🔧 Registering agent: %s", self.agent_domain)
+        
+        if self.agent_id:
+            log.info("✅ Agent already registered with ID: %s", self.agent_id)
+            return None
         
         # Check if already registered
         try:
-            existing_agent = self.identity_registry.functions.resolveByAddress(self.address).call()
+            existing_agent = self._resolve_by_address()
             if existing_agent[0] > 0:  # agentId > 0 means already registered
-                self.agent_id = existing_agent[0]
-                rprint(f"[green]✅ Agent already registered with ID: {self.agent_id}[/green]")
-                return self.agent_id, "already_registered"
+                self._set_agent_id(existing_agent[0])
+                log.info("✅ Agent already registered with ID: %s", self.agent_id)
+                return None
         except Exception as e:
             # Agent not found, proceed with registration
-            rprint(f"[blue]🔍 Agent not yet registered (expected): {e}[/blue]")
+            log.info("🔍 Agent not yet registered (expected): %s", e)
             pass
         
         # Use wallet manager to execute the transaction
@@ -166,11 +347,10 @@ class GenesisBaseAgent:
             raise ValueError("Wallet manager not available for transaction signing")
         
         # Get the agent's wallet
-        agent_name = self._get_agent_name_from_domain()
-        wallet = self.wallet_manager.wallets.get(agent_name)
+        wallet = self._get_wallet()
         
         if not wallet:
-            raise ValueError(f"Wallet not found for agent: {agent_name}")
+            raise ValueError(f"Wallet not found for agent: {self._agent_name}")
         
         try:
             # Prepare contract call data
@@ -180,90 +360,88 @@ class GenesisBaseAgent:
             )
             
             # Execute via Coinbase AgentKit wallet
-            rprint(f"[blue]📝 Executing registration transaction...[/blue]")
-            
-            # Estimate gas first
-            gas_estimate = contract_call.estimate_gas({'from': self.address})
-            gas_limit = int(gas_estimate * 1.2)  # Add 20% buffer
+            log.debug("📝 Executing registration transaction...")
             
-            rprint(f"[blue]⛽ Gas estimate: {gas_estimate}, using limit: {gas_limit}[/blue]")
-            
-            # Build transaction
-            transaction = contract_call.build_transaction({
-                'from': self.address,
-                'gas': gas_limit,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
-                'chainId': self.chain_id
-            })
+            # Build transaction (static gas limit; estimated on local)
+            transaction = self._build_tx(contract_call, gas=self._gas_limit('newAgent'))
             
             # Sign and send via wallet manager
             # Note: This is a simplified approach - in practice, we'd use the AgentKit's transaction methods
-            signed_txn = wallet.sign_transaction(transaction)
-            # Handle different Web3.py versions
-            raw_transaction = signed_txn.raw_transaction if hasattr(signed_txn, 'raw_transaction') else signed_txn.rawTransaction
-            tx_hash = self.w3.eth.send_raw_transaction(raw_transaction)
+            return self._sign_and_send(wallet, transaction)
+                
+        except Exception as e:
+            log.error("❌ Registration failed: %s", e)
+            raise
+    
+    def await_registration(self, tx_hash) -> Tuple[int, str]:
+        """
+        Wait for a registration sent by build_and_send_registration
+        
+        Args:
+            tx_hash: Hash returned by build_and_send_registration
             
+        Returns:
+            Tuple of (agent_id, transaction_hash)
+        """
+        
+        try:
             # Wait for confirmation
-            rprint(f"[blue]⏳ Waiting for transaction confirmation...[/blue]")
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            log.debug("⏳ Waiting for transaction confirmation...")
+            receipt = self._wait_for_receipt(tx_hash)
             
             if receipt.status == 1:
                 # Parse the agent ID from events
                 agent_id = self._parse_agent_id_from_receipt(receipt)
                 
                 if agent_id:
-                    self.agent_id = agent_id
-                    rprint(f"[green]✅ Agent registered successfully with ID: {agent_id}[/green]")
+                    self._set_agent_id(agent_id)
+                    log.info("✅ Agent registered successfully with ID: %s", agent_id)
                     return agent_id, tx_hash.hex()
                 else:
                     raise Exception("Registration succeeded but couldn't determine agent ID")
             else:
-                rprint(f"[red]❌ Transaction failed with status: {receipt.status}[/red]")
-                rprint(f"[red]   Gas used: {receipt.gasUsed}[/red]")
-                rprint(f"[red]   Transaction hash: {tx_hash.hex()}[/red]")
+                log.error("❌ Transaction failed with status: %s", receipt.status)
+                log.error("   Gas used: %s", receipt.gasUsed)
+                log.error("   Transaction hash: %s", tx_hash.hex())
                 raise Exception(f"Registration transaction failed with status {receipt.status}")
                 
         except Exception as e:
-            rprint(f"[red]❌ Registration failed: {e}[/red]")
+            log.error("❌ Registration failed: %s", e)
             raise
     
     def _get_agent_name_from_domain(self) -> str:
         """Extract agent name from domain"""
-        # Simple extraction: alice.chaoschain-genesis-studio.com -> Alice
-        if "alice" in self.agent_domain.lower():
-            return "Alice"
-        elif "bob" in self.agent_domain.lower():
-            return "Bob"
-        elif "charlie" in self.agent_domain.lower():
-            return "Charlie"
-        else:
-            return "Unknown"
+        return self._agent_name
+    
+    def _get_wallet(self):
+        """Get this agent's wallet, looking it up in the wallet manager only until found"""
+        if self._wallet is None and self.wallet_manager:
+            self._wallet = self.wallet_manager.wallets.get(self._agent_name)
+        return self._wallet
     
     def _parse_agent_id_from_receipt(self, receipt) -> Optional[int]:
         """Parse agent ID from transaction receipt"""
         
         try:
             # Process AgentRegistered events
-            logs = self.identity_registry.events.AgentRegistered().process_receipt(receipt)
-            if logs and len(logs) > 0:
-                return logs[0]['args']['agentId']
+            agent_id = agent_id_from_receipt(self._agent_registered_event, receipt)
+            if agent_id is not None:
+                return agent_id
+        except Exception as e:
+            log.warning("⚠️  Could not parse event logs: %s", e)
+        
+        # Fallback: block logs and resolveByAddress in a single batch
+        try:
+            return lookup_registered_agent_id(self.identity_registry, self.address, receipt.blockHash)
         except Exception as e:
-            rprint(f"[yellow]⚠️  Could not parse event logs: {e}[/yellow]")
-        
-        # Fallback: query by address with retry
-        for attempt in range(3):
-            try:
-                time.sleep(1)  # Wait for state to update
-                agent_info = self.identity_registry.functions.resolveByAddress(self.address).call()
-                if agent_info[0] > 0:
-                    return agent_info[0]
-            except Exception as e:
-                rprint(f"[yellow]⚠️  Retry {attempt + 1}: {e}[/yellow]")
-                continue
+            log.warning("⚠️  Could not resolve agent by address: %s", e)
         
         return None
     
+    def calculate_cid_hash(self, cid: str) -> str:
+        """Calculate a bytes32 hash from an IPFS CID for blockchain storage (memoized per CID)"""
+        return self._cid_hasher(cid)
+    
     def request_validation(self, validator_agent_id: int, data_hash: str) -> str:
         """
         Request validation from another agent
@@ -276,50 +454,40 @@ class GenesisBaseAgent:
             Transaction hash
         """
         
-        rprint(f"[blue]🔍 Requesting validation from agent {validator_agent_id}[/blue]")
+        log.info("🔍 Requesting validation from agent %s", validator_agent_id)
         
         if not self.wallet_manager:
             raise ValueError("Wallet manager not available")
         
-        agent_name = self._get_agent_name_from_domain()
-        wallet = self.wallet_manager.wallets.get(agent_name)
+        wallet = self._get_wallet()
         
         if not wallet:
-            raise ValueError(f"Wallet not found for agent: {agent_name}")
+            raise ValueError(f"Wallet not found for agent: {self._agent_name}")
         
         try:
             # Prepare validation request
-            contract_call = self.validation_registry.functions.validationRequest(
+            contract_call = self._fn_validation_request(
                 validator_agent_id,
                 self.agent_id,
                 data_hash
             )
             
             # Build and execute transaction (simplified)
-            transaction = contract_call.build_transaction({
-                'from': self.address,
-                'gas': 150000,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
-                'chainId': self.chain_id
-            })
+            transaction = self._build_tx(contract_call, gas=self._gas_limit('validationRequest'))
             
-            signed_txn = wallet.sign_transaction(transaction)
-            # Handle different Web3.py versions
-            raw_transaction = signed_txn.raw_transaction if hasattr(signed_txn, 'raw_transaction') else signed_txn.rawTransaction
-            tx_hash = self.w3.eth.send_raw_transaction(raw_transaction)
+            tx_hash = self._sign_and_send(wallet, transaction)
             
             # Wait for confirmation
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = self._wait_for_receipt(tx_hash)
             
             if receipt.status == 1:
-                rprint(f"[green]✅ Validation request submitted[/green]")
+                log.info("✅ Validation request submitted")
                 return tx_hash.hex()
             else:
                 raise Exception("Validation request transaction failed")
                 
         except Exception as e:
-            rprint(f"[red]❌ Validation request failed: {e}[/red]")
+            log.error("❌ Validation request failed: %s", e)
             raise
     
     def submit_validation_response(self, data_hash: str, response: int) -> str:
@@ -334,51 +502,58 @@ class GenesisBaseAgent:
             Transaction hash
         """
         
-        rprint(f"[blue]📊 Submitting validation response: {response}/100[/blue]")
+        log.info("📊 Submitting validation response: %s/100", response)
         
         if not self.wallet_manager:
             raise ValueError("Wallet manager not available")
         
-        agent_name = self._get_agent_name_from_domain()
-        wallet = self.wallet_manager.wallets.get(agent_name)
+        wallet = self._get_wallet()
         
         if not wallet:
-            raise ValueError(f"Wallet not found for agent: {agent_name}")
+            raise ValueError(f"Wallet not found for agent: {self._agent_name}")
         
         try:
             # Prepare validation response
-            contract_call = self.validation_registry.functions.validationResponse(
+            contract_call = self._fn_validation_response(
                 data_hash,
                 response
             )
             
             # Build and execute transaction (simplified)
-            transaction = contract_call.build_transaction({
-                'from': self.address,
-                'gas': 150000,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
-                'chainId': self.chain_id
-            })
+            transaction = self._build_tx(contract_call, gas=self._gas_limit('validationResponse'))
             
-            signed_txn = wallet.sign_transaction(transaction)
-            # Handle different Web3.py versions
-            raw_transaction = signed_txn.raw_transaction if hasattr(signed_txn, 'raw_transaction') else signed_txn.rawTransaction
-            tx_hash = self.w3.eth.send_raw_transaction(raw_transaction)
+            tx_hash = self._sign_and_send(wallet, transaction)
             
             # Wait for confirmation
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = self._wait_for_receipt(tx_hash)
             
             if receipt.status == 1:
-                rprint(f"[green]✅ Validation response submitted[/green]")
+                log.info("✅ Validation response submitted")
                 return tx_hash.hex()
             else:
                 raise Exception("Validation response transaction failed")
                 
         except Exception as e:
-            rprint(f"[red]❌ Validation response failed: {e}[/red]")
+            log.error("❌ Validation response failed: %s", e)
             raise
     
+    # === Async variants ===
+    # The agents are synchronous; these run the blocking send + receipt wait on
+    # a worker thread so an asyncio orchestrator can overlap several agents'
+    # confirmations instead of stalling its event loop on each one.
+    
+    async def register_agent_async(self) -> Tuple[int, str]:
+        """Async variant of register_agent"""
+        return await asyncio.to_thread(self.register_agent)
+    
+    async def request_validation_async(self, validator_agent_id: int, data_hash: str) -> str:
+        """Async variant of request_validation"""
+        return await asyncio.to_thread(self.request_validation, validator_agent_id, data_hash)
+    
+    async def submit_validation_response_async(self, data_hash: str, response: int) -> str:
+        """Async variant of submit_validation_response"""
+        return await asyncio.to_thread(self.submit_validation_response, data_hash, response)
+    
     def get_agent_info(self) -> Optional[Dict[str, Any]]:
         """Get agent information from the registry"""
         
@@ -392,6 +567,30 @@ class GenesisBaseAgent:
                     "is_active": agent_info[3]
                 }
         except Exception as e:
-            rprint(f"[yellow]⚠️  Could not retrieve agent info: {e}[/yellow]")
+            log.warning("⚠️  Could not retrieve agent info: %s", e)
         
         return None
+    
+    def get_agents_info(self, agent_ids: List[int]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get information about several agents in a single Multicall3 eth_call
+        
+        Args:
+            agent_ids: Registry IDs to look up
+            
+        Returns:
+            One info dict per ID, in order; None for IDs that don't resolve
+        """
+        results = multicall(
+            self.w3,
+            [self.identity_registry.functions.getAgent(agent_id) for agent_id in agent_ids],
+            self.multicall3_address
+        )
+        return [
+            {
+                "agent_id": result[0],
+                "domain": result[1],
+                "address": result[2]
+            } if result else None
+            for result in results
+        ]
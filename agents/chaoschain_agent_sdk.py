@@ -6,19 +6,28 @@ with the ChaosChain protocol, including ERC-8004 identity, x402 payments, IPFS s
 and the Genesis Studio ecosystem.
 """
 
+import asyncio
 import json
+import logging
 import os
-from typing import Dict, Any, Optional, Tuple, Union
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property, partial
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime
-from rich import print as rprint
 
 from .base_agent_genesis import GenesisBaseAgent
-from .server_agent_genesis import GenesisServerAgent
-from .validator_agent_genesis import GenesisValidatorAgent
 from .simple_wallet_manager import GenesisWalletManager
-from .ipfs_storage import GenesisIPFSManager
+from .ipfs_storage import IPFS_EXECUTOR, GenesisIPFSManager, serialize_json
+from .log_utils import get_logger
 from .x402_payment_manager import GenesisX402PaymentManager
 
+log = get_logger(__name__)
+
+# Waits for receipts of transactions sent without blocking the caller (submit_feedback(wait=False))
+_CONFIRM_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="chaoschain-confirm")
+
 
 class ChaosChainAgentSDK:
     """
@@ -32,6 +41,26 @@ class ChaosChainAgentSDK:
     - Genesis Studio integration
     """
     
+    # Seconds a get_agent_info result is reused before re-reading the registry
+    AGENT_INFO_TTL = 30.0
+    
+    # Seconds a formatted timestamp is reused across packages/results in a batch
+    TIMESTAMP_TICK = 0.01
+    
+    # Above this many receipts, payment proofs are stored column-wise (one list per field)
+    COLUMNAR_RECEIPTS_THRESHOLD = 16
+    
+    # Fixed role of a role-specialized subclass
+    AGENT_ROLE: Optional[str] = None
+    
+    def __new__(cls, *args, **kwargs):
+        # ChaosChainAgentSDK(..., agent_role="server") hands back the role's subclass,
+        # so role-specific methods are resolved once at construction
+        if cls is ChaosChainAgentSDK:
+            agent_role = kwargs.get("agent_role", args[2] if len(args) > 2 else "client")
+            cls = _ROLE_SDK_CLASSES.get(agent_role, cls)
+        return super().__new__(cls)
+    
     def __init__(
         self, 
         agent_name: str,
@@ -50,59 +79,87 @@ class ChaosChainAgentSDK:
         """
         self.agent_name = agent_name
         self.agent_domain = agent_domain
-        self.agent_role = agent_role
+        self.agent_role = self.AGENT_ROLE or agent_role
         self.network = network
         
+        # Serializes transaction sends so concurrent async submissions don't race on the nonce
+        self._send_lock = threading.Lock()
+        
+        # (timestamp, info) of the last registry read
+        self._agent_info_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        
+        # tx hash -> receipt wait for feedback sent with wait=False
+        self._pending_txs: Dict[str, Future] = {}
+        # Hashes of those that confirmed, until wait_for_pending_feedback collects them
+        self._confirmed_txs: List[str] = []
+        self._confirmed_lock = threading.Lock()
+        
+        # (monotonic time, ISO string) of the last formatted wall-clock timestamp
+        self._now_str_cache: Tuple[float, str] = (float("-inf"), "")
+        
+        # Static part of every evidence package header
+        self._evidence_header = {
+            "version": "1.0.0",
+            "agent_name": agent_name,
+            "agent_domain": agent_domain,
+            "network": network
+        }
+        
         # Initialize core components
         self._initialize_components()
         
         # Initialize the appropriate agent type
         self._initialize_agent()
         
-        rprint(f"[green]🚀 ChaosChain Agent SDK initialized for {agent_name} ({agent_role})[/green]")
-        rprint(f"[blue]   Domain: {agent_domain}[/blue]")
-        rprint(f"[blue]   Network: {network}[/blue]")
+        if log.isEnabledFor(logging.INFO):
+            log.info("🚀 ChaosChain Agent SDK initialized for %s (%s)", agent_name, agent_role)
+            log.info("   Domain: %s", agent_domain)
+            log.info("   Network: %s", network)
     
     def _initialize_components(self):
         """Initialize all SDK components"""
         
-        # Core wallet management
-        self.wallet_manager = GenesisWalletManager()
-        
-        # IPFS storage for evidence
-        self.ipfs_manager = GenesisIPFSManager()
+        # Core wallet management (needed by every role); IPFS and payment
+        # managers are created on first use
+        self.wallet_manager = GenesisWalletManager.shared()
         
-        # x402 payment processing
-        self.payment_manager = GenesisX402PaymentManager(
+        # Create or load wallet for this agent
+        self.wallet = self.wallet_manager.create_or_load_wallet(self.agent_name)
+        self.wallet_address = self.wallet.address
+    
+    @cached_property
+    def ipfs_manager(self) -> GenesisIPFSManager:
+        """IPFS storage for evidence, created on first use"""
+        return GenesisIPFSManager()
+    
+    @cached_property
+    def payment_manager(self) -> GenesisX402PaymentManager:
+        """x402 payment processing, created on first use"""
+        return GenesisX402PaymentManager(
             wallet_manager=self.wallet_manager,
             network=self.network
         )
+    
+    @classmethod
+    def _agent_class(cls) -> type:
+        """
+        Agent class this SDK class was specialized for
         
-        # Create or load wallet for this agent
-        self.wallet = self.wallet_manager.create_or_load_wallet(self.agent_name)
-        self.wallet_address = self.wallet_manager.get_wallet_address(self.agent_name)
+        Role agents are imported here rather than at module load, so client
+        SDKs never pay for importing CrewAI.
+        """
+        return GenesisBaseAgent
     
     def _initialize_agent(self):
-        """Initialize the appropriate agent type based on role"""
+        """Initialize the agent type this SDK class was specialized for"""
+        self.agent = self._agent_class()(
+            agent_domain=self.agent_domain,
+            wallet_address=self.wallet_address,
+            wallet_manager=self.wallet_manager
+        )
         
-        if self.agent_role == "server":
-            self.agent = GenesisServerAgent(
-                agent_domain=self.agent_domain,
-                wallet_address=self.wallet_address,
-                wallet_manager=self.wallet_manager
-            )
-        elif self.agent_role == "validator":
-            self.agent = GenesisValidatorAgent(
-                agent_domain=self.agent_domain,
-                wallet_address=self.wallet_address,
-                wallet_manager=self.wallet_manager
-            )
-        else:  # client or generic
-            self.agent = GenesisBaseAgent(
-                agent_domain=self.agent_domain,
-                wallet_address=self.wallet_address,
-                wallet_manager=self.wallet_manager
-            )
+        # Feedback transactions only vary in nonce and gas price, so the gas limit is bound once
+        self._build_feedback_tx = partial(self.agent._build_tx, gas=self.agent._gas_limit('acceptFeedback'))
     
     # === ERC-8004 Registry Management ===
     
@@ -113,71 +170,179 @@ class ChaosChainAgentSDK:
         Returns:
             Tuple of (agent_id, transaction_hash)
         """
-        rprint(f"[blue]🆔 Registering {self.agent_name} on ERC-8004 IdentityRegistry[/blue]")
+        log.info("🆔 Registering %s on ERC-8004 IdentityRegistry", self.agent_name)
+        self.refresh_identity()
         return self.agent.register_agent()
     
+    def send_identity_registration(self) -> Optional[Any]:
+        """
+        Broadcast the identity registration without waiting for it to be mined
+        
+        Returns:
+            Transaction hash to pass to await_identity_registration, or None
+            if the agent is already registered
+        """
+        log.info("🆔 Registering %s on ERC-8004 IdentityRegistry", self.agent_name)
+        return self.agent.build_and_send_registration()
+    
+    def await_identity_registration(self, tx_hash: Optional[Any]) -> Tuple[int, str]:
+        """
+        Wait for a registration sent by send_identity_registration
+        
+        Returns:
+            Tuple of (agent_id, transaction_hash)
+        """
+        if tx_hash is None:
+            return self.agent.agent_id, "already_registered"
+        return self.agent.await_registration(tx_hash)
+    
     def get_agent_id(self) -> Optional[int]:
-        """Get the agent's on-chain ID"""
+        """Get the agent's on-chain ID (held in memory; no RPC)"""
         return self.agent.agent_id
     
     def get_agent_info(self) -> Optional[Dict[str, Any]]:
-        """Get complete agent information"""
-        return self.agent.get_agent_info()
+        """
+        Get complete agent information
+        
+        Registry entries effectively never change after registration, so the
+        result is reused for AGENT_INFO_TTL seconds; call refresh_identity()
+        to force a fresh read.
+        """
+        now = time.monotonic()
+        if self._agent_info_cache is not None and now - self._agent_info_cache[0] < self.AGENT_INFO_TTL:
+            return dict(self._agent_info_cache[1])
+        
+        agent_info = self.agent.get_agent_info()
+        if agent_info is not None:
+            self._agent_info_cache = (now, agent_info)
+            return dict(agent_info)
+        return None
+    
+    def refresh_identity(self):
+        """Drop cached identity data so the next get_agent_info reads the registry"""
+        self._agent_info_cache = None
     
-    def submit_feedback(self, server_agent_id: int) -> str:
+    def submit_feedback(self, server_agent_id: int, wait: bool = True) -> str:
         """
         Submit feedback to ERC-8004 ReputationRegistry
         
         Args:
             server_agent_id: ID of the server agent to provide feedback for
+            wait: Block until the transaction is mined; with False the hash is
+                returned right after broadcast and the receipt is awaited in
+                the background (see wait_for_pending_feedback)
             
         Returns:
             Transaction hash
         """
-        rprint(f"[blue]📝 Submitting feedback for agent {server_agent_id} to ReputationRegistry[/blue]")
+        try:
+            tx_hash = self._send_feedback(server_agent_id)
+            if wait:
+                return self._confirm_feedback(tx_hash)
+        except Exception as e:
+            log.error("❌ Feedback submission failed: %s", e)
+            raise
+        
+        tx_hex = tx_hash.hex()
+        future = _CONFIRM_EXECUTOR.submit(self._confirm_and_record_feedback, tx_hash)
+        self._pending_txs[tx_hex] = future
+        future.add_done_callback(lambda done: self._on_feedback_confirmed(tx_hex, done))
+        return tx_hex
+    
+    def _confirm_and_record_feedback(self, tx_hash) -> str:
+        """Background receipt wait; records the hash before the future resolves"""
+        tx_hex = self._confirm_feedback(tx_hash)
+        with self._confirmed_lock:
+            self._confirmed_txs.append(tx_hex)
+        return tx_hex
+    
+    def _on_feedback_confirmed(self, tx_hex: str, future: Future):
+        """Drop a background feedback wait once it finishes, reporting failures"""
+        self._pending_txs.pop(tx_hex, None)
+        error = future.exception()
+        if error is not None:
+            log.error("❌ Feedback transaction %s failed: %s", tx_hex, error)
+    
+    def wait_for_pending_feedback(self) -> List[str]:
+        """
+        Block until all feedback sent with wait=False has been mined
+        
+        Returns:
+            Hashes of the transactions that confirmed successfully since the
+            last call, including ones that had already confirmed before it
+        """
+        for future in list(self._pending_txs.values()):
+            try:
+                future.result()
+            except Exception:
+                pass  # already reported by _on_feedback_confirmed
+        with self._confirmed_lock:
+            confirmed, self._confirmed_txs = self._confirmed_txs, []
+        return confirmed
+    
+    async def submit_feedback_async(self, server_agent_id: int) -> str:
+        """
+        Async variant of submit_feedback
+        
+        The send and the receipt wait run on worker threads, so several
+        submissions awaited together (see submit_feedbacks_async) are all in
+        flight at once and confirm in roughly one block time.
+        """
+        try:
+            tx_hash = await asyncio.to_thread(self._send_feedback, server_agent_id)
+            return await asyncio.to_thread(self._confirm_feedback, tx_hash)
+        except Exception as e:
+            log.error("❌ Feedback submission failed: %s", e)
+            raise
+    
+    async def submit_feedbacks_async(self, server_agent_ids: List[int]) -> List[str]:
+        """
+        Submit feedback for several server agents concurrently
+        
+        Args:
+            server_agent_ids: IDs of the server agents to provide feedback for
+            
+        Returns:
+            Transaction hashes, in the same order
+        """
+        return list(await asyncio.gather(*[
+            self.submit_feedback_async(server_agent_id) for server_agent_id in server_agent_ids
+        ]))
+    
+    def _send_feedback(self, server_agent_id: int):
+        """Build, sign and broadcast an acceptFeedback transaction without waiting"""
+        log.info("📝 Submitting feedback for agent %s to ReputationRegistry", server_agent_id)
         
         # Use the reputation registry from the base agent
         if not self.agent.wallet_manager:
             raise ValueError("Wallet manager not available")
         
-        agent_name = self.agent._get_agent_name_from_domain()
-        wallet = self.agent.wallet_manager.wallets.get(agent_name)
+        wallet = self.agent._get_wallet()
         
         if not wallet:
-            raise ValueError(f"Wallet not found for agent: {agent_name}")
+            raise ValueError(f"Wallet not found for agent: {self.agent._agent_name}")
         
-        try:
-            # Prepare feedback submission
-            contract_call = self.agent.reputation_registry.functions.acceptFeedback(
-                self.agent.agent_id,
-                server_agent_id
-            )
-            
-            # Build and execute transaction
-            transaction = contract_call.build_transaction({
-                'from': self.agent.address,
-                'gas': 150000,
-                'gasPrice': self.agent.w3.eth.gas_price,
-                'nonce': self.agent.w3.eth.get_transaction_count(self.agent.address),
-                'chainId': self.agent.chain_id
-            })
-            
-            signed_txn = wallet.sign_transaction(transaction)
-            raw_transaction = signed_txn.raw_transaction if hasattr(signed_txn, 'raw_transaction') else signed_txn.rawTransaction
-            tx_hash = self.agent.w3.eth.send_raw_transaction(raw_transaction)
-            
-            # Wait for confirmation
-            receipt = self.agent.w3.eth.wait_for_transaction_receipt(tx_hash)
-            
-            if receipt.status == 1:
-                rprint(f"[green]✅ Feedback submitted successfully[/green]")
-                return tx_hash.hex()
-            else:
-                raise Exception("Feedback submission transaction failed")
-                
-        except Exception as e:
-            rprint(f"[red]❌ Feedback submission failed: {e}[/red]")
-            raise
+        # Prepare feedback submission
+        contract_call = self.agent._fn_accept_feedback(
+            self.agent.agent_id,
+            server_agent_id
+        )
+        
+        # Sends are serialized so concurrent submissions take consecutive nonces;
+        # gas price is TTL-cached and the nonce tracked by the shared wallet manager
+        with self._send_lock:
+            transaction = self._build_feedback_tx(contract_call)
+            return self.agent._sign_and_send(wallet, transaction)
+    
+    def _confirm_feedback(self, tx_hash) -> str:
+        """Wait for a feedback transaction sent by _send_feedback"""
+        receipt = self.agent._wait_for_receipt(tx_hash)
+        
+        if receipt.status == 1:
+            log.info("✅ Feedback submitted successfully")
+            return tx_hash.hex()
+        else:
+            raise Exception("Feedback submission transaction failed")
     
     # === Payment Management ===
     
@@ -275,6 +440,22 @@ class ChaosChainAgentSDK:
             # Generic evidence storage
             return self.ipfs_manager.store_generic_evidence(evidence_data, self.agent.agent_id, evidence_type)
     
+    def store_evidence_bulk(self, items: List[Tuple[Dict[str, Any], str]]) -> List[Optional[str]]:
+        """
+        Store several pieces of evidence on IPFS concurrently
+        
+        Uploads are independent, so they are issued in parallel and the batch
+        takes roughly as long as the slowest upload rather than the sum.
+        
+        Args:
+            items: (evidence_data, evidence_type) pairs, as for store_evidence
+            
+        Returns:
+            IPFS CIDs in the same order (None for failed uploads)
+        """
+        futures = [IPFS_EXECUTOR.submit(self.store_evidence, data, evidence_type) for data, evidence_type in items]
+        return [future.result() for future in futures]
+    
     def retrieve_evidence(self, cid: str, evidence_type: str = "analysis") -> Optional[Dict[str, Any]]:
         """
         Retrieve evidence from IPFS
@@ -293,6 +474,36 @@ class ChaosChainAgentSDK:
         else:
             return self.ipfs_manager.retrieve_generic_evidence(cid)
     
+    def prefetch_evidence(self, cids: List[str]):
+        """
+        Fetch several evidence CIDs from IPFS in parallel
+        
+        Populates the IPFS cache so the following retrieve_evidence calls for
+        these CIDs don't each pay a gateway round trip.
+        
+        Args:
+            cids: IPFS CIDs to fetch
+        """
+        self.ipfs_manager.prefetch(cids)
+    
+    def retrieve_evidence_package(self, cid: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve an evidence package and prefetch the evidence it references
+        
+        Args:
+            cid: IPFS CID of a package stored via store_evidence
+            
+        Returns:
+            The evidence package if found
+        """
+        report = self.ipfs_manager.retrieve_generic_evidence(cid)
+        if not report:
+            return None
+        
+        evidence_package = report.get("evidence", {})
+        self.prefetch_evidence(evidence_package.get("related_evidence_cids", []))
+        return evidence_package
+    
     def create_evidence_package(
         self,
         work_data: Dict[str, Any],
@@ -310,59 +521,96 @@ class ChaosChainAgentSDK:
         Returns:
             Complete evidence package
         """
+        payment_receipts = payment_receipts or []
+        header = dict(self._evidence_header)
+        header["agent_id"] = self.agent.agent_id
+        header["created_at"] = self._now_iso()
+        
+        if len(payment_receipts) > self.COLUMNAR_RECEIPTS_THRESHOLD:
+            header["payment_proofs_layout"] = "columnar"
+            payment_proofs, absent = self._receipts_to_columns(payment_receipts)
+            if absent:
+                header["payment_proofs_absent"] = absent
+        else:
+            payment_proofs = payment_receipts
+        
         evidence_package = {
-            "chaoschain_evidence_package": {
-                "version": "1.0.0",
-                "agent_id": self.agent.agent_id,
-                "agent_name": self.agent_name,
-                "agent_domain": self.agent_domain,
-                "created_at": datetime.now().isoformat(),
-                "network": self.network
-            },
+            "chaoschain_evidence_package": header,
             "work_data": work_data,
-            "payment_proofs": payment_receipts or [],
+            "payment_proofs": payment_proofs,
             "related_evidence_cids": related_evidence or [],
             "metadata": {
                 "evidence_type": "comprehensive_package",
-                "contains_payment_proofs": len(payment_receipts or []) > 0,
+                "contains_payment_proofs": len(payment_receipts) > 0,
+                "payment_proof_count": len(payment_receipts),
                 "related_evidence_count": len(related_evidence or [])
             }
         }
         
         return evidence_package
     
-    # === Service-Specific Methods ===
-    
-    def generate_market_analysis(self, symbol: str, timeframe: str = "1d") -> Dict[str, Any]:
+    @staticmethod
+    def _receipts_to_columns(receipts: List[Dict[str, Any]]) -> Tuple[Dict[str, List[Any]], Dict[str, List[int]]]:
         """
-        Generate market analysis (for server agents)
+        Transpose receipts into one list per field
         
-        Args:
-            symbol: Trading symbol to analyze
-            timeframe: Analysis timeframe
-            
         Returns:
-            Market analysis data
+            Tuple of (columns, absent): a receipt lacking a field has None in
+            that column and its index listed under the field in absent, so it
+            stays distinct from a receipt whose value really is None
         """
-        if not isinstance(self.agent, GenesisServerAgent):
-            raise ValueError("Market analysis only available for server agents")
-        
-        return self.agent.generate_market_analysis(symbol, timeframe)
-    
-    def validate_analysis(self, analysis_data: Dict[str, Any]) -> Dict[str, Any]:
+        fields = list(dict.fromkeys(key for receipt in receipts for key in receipt))
+        columns = {field: [receipt.get(field) for receipt in receipts] for field in fields}
+        absent = {}
+        for field in fields:
+            missing = [i for i, receipt in enumerate(receipts) if field not in receipt]
+            if missing:
+                absent[field] = missing
+        return columns, absent
+    
+    @staticmethod
+    def get_payment_proofs(evidence_package: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
-        Validate analysis data (for validator agents)
+        Get an evidence package's payment receipts as a list of dicts, whatever its layout
         
         Args:
-            analysis_data: Analysis data to validate
+            evidence_package: Package from create_evidence_package (or retrieved from IPFS)
             
         Returns:
-            Validation result
+            List of payment receipts
         """
-        if not isinstance(self.agent, GenesisValidatorAgent):
-            raise ValueError("Analysis validation only available for validator agents")
+        proofs = evidence_package.get("payment_proofs", [])
+        header = evidence_package.get("chaoschain_evidence_package", {})
+        if header.get("payment_proofs_layout") != "columnar":
+            return proofs
+        
+        columns = list(proofs.items())
+        count = len(columns[0][1]) if columns else 0
+        absent = {field: set(indices) for field, indices in header.get("payment_proofs_absent", {}).items()}
+        no_gaps = set()
+        return [
+            {field: values[i] for field, values in columns if i not in absent.get(field, no_gaps)}
+            for i in range(count)
+        ]
+    
+    def create_evidence_package_bytes(
+        self,
+        work_data: Dict[str, Any],
+        payment_receipts: Optional[list[Dict[str, Any]]] = None,
+        related_evidence: Optional[list[str]] = None
+    ) -> bytes:
+        """
+        Create an evidence package already serialized to JSON
         
-        return self.agent.validate_analysis(analysis_data)
+        The bytes can be passed straight to PinataIPFSStorage.upload_json,
+        skipping a second serialization of the package.
+        
+        Returns:
+            JSON-encoded evidence package
+        """
+        return serialize_json(self.create_evidence_package(work_data, payment_receipts, related_evidence))
+    
+    # === Validation Registry ===
     
     def request_validation(self, validator_agent_id: int, data_hash: str) -> str:
         """
@@ -390,7 +638,88 @@ class ChaosChainAgentSDK:
         """
         return self.agent.submit_validation_response(data_hash, score)
     
-    # === Complete Service Workflows ===
+    # === SDK Utilities ===
+    
+    def _now_iso(self) -> str:
+        """Current time as an ISO-8601 string (millisecond precision), reformatted at most once per tick"""
+        now = time.monotonic()
+        cached_at, cached = self._now_str_cache
+        if now - cached_at < self.TIMESTAMP_TICK:
+            return cached
+        formatted = datetime.now().isoformat(timespec="milliseconds")
+        self._now_str_cache = (now, formatted)
+        return formatted
+    
+    @staticmethod
+    def to_json(data: Any, indent: bool = False) -> str:
+        """
+        Serialize SDK results (status, evidence packages, workflow results) to JSON
+        
+        Uses orjson when installed, which also accepts datetimes and dataclasses.
+        """
+        return serialize_json(data, indent=indent).decode()
+    
+    def get_sdk_status(self) -> Dict[str, Any]:
+        """
+        Get comprehensive SDK status
+        
+        The lazily created IPFS and payment managers are reported as not
+        initialized (and payment_stats as None) until first used, rather
+        than being created just to report on them.
+        """
+        payment_manager = self.__dict__.get('payment_manager')
+        return {
+            "agent_info": {
+                "name": self.agent_name,
+                "domain": self.agent_domain,
+                "role": self.agent_role,
+                "agent_id": self.agent.agent_id,
+                "wallet_address": self.wallet_address
+            },
+            "network_info": {
+                "network": self.network,
+                "connected": True  # Simplified check
+            },
+            "component_status": {
+                "wallet_manager": bool(self.wallet_manager),
+                "ipfs_manager": 'ipfs_manager' in self.__dict__,
+                "payment_manager": payment_manager is not None,
+                "agent": bool(self.agent)
+            },
+            "payment_stats": payment_manager.generate_payment_summary() if payment_manager is not None else None,
+            "sdk_version": "1.0.0",
+            "generated_at": self._now_iso()
+        }
+
+
+class ClientSDK(ChaosChainAgentSDK):
+    """SDK for client agents, which request and pay for services"""
+    
+    AGENT_ROLE = "client"
+
+
+class ServerSDK(ChaosChainAgentSDK):
+    """SDK for server agents, which sell market analysis"""
+    
+    AGENT_ROLE = "server"
+    
+    @classmethod
+    def _agent_class(cls) -> type:
+        from .server_agent_genesis import GenesisServerAgent
+        return GenesisServerAgent
+    
+    def generate_market_analysis(self, symbol: str, timeframe: str = "1d") -> Dict[str, Any]:
+        """
+        Generate market analysis
+        
+        Args:
+            symbol: Trading symbol to analyze
+            timeframe: Analysis timeframe
+            
+        Returns:
+            Market analysis data
+        """
+        return self.agent.generate_market_analysis(symbol, timeframe)
     
     def execute_paid_analysis_workflow(
         self,
@@ -415,10 +744,7 @@ class ChaosChainAgentSDK:
         Returns:
             Complete workflow result
         """
-        if self.agent_role != "server":
-            raise ValueError("Paid analysis workflow only available for server agents")
-        
-        rprint(f"[blue]🔄 Executing paid analysis workflow for {symbol}[/blue]")
+        log.info("🔄 Executing paid analysis workflow for %s", symbol)
         
         # Step 1: Generate analysis
         analysis_data = self.generate_market_analysis(symbol)
@@ -446,11 +772,34 @@ class ChaosChainAgentSDK:
             "server_agent": self.agent_name,
             "client_agent": client_agent,
             "base_payment": base_payment,
-            "completed_at": datetime.now().isoformat()
+            "completed_at": self._now_iso()
         }
         
-        rprint(f"[green]✅ Paid analysis workflow completed[/green]")
+        log.info("✅ Paid analysis workflow completed")
         return workflow_result
+
+
+class ValidatorSDK(ChaosChainAgentSDK):
+    """SDK for validator agents, which score other agents' analyses"""
+    
+    AGENT_ROLE = "validator"
+    
+    @classmethod
+    def _agent_class(cls) -> type:
+        from .validator_agent_genesis import GenesisValidatorAgent
+        return GenesisValidatorAgent
+    
+    def validate_analysis(self, analysis_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate analysis data
+        
+        Args:
+            analysis_data: Analysis data to validate
+            
+        Returns:
+            Validation result
+        """
+        return self.agent.validate_analysis(analysis_data)
     
     def execute_validation_workflow(
         self,
@@ -469,10 +818,7 @@ class ChaosChainAgentSDK:
         Returns:
             Complete validation workflow result
         """
-        if self.agent_role != "validator":
-            raise ValueError("Validation workflow only available for validator agents")
-        
-        rprint(f"[blue]🔍 Executing validation workflow for {analysis_cid}[/blue]")
+        log.info("🔍 Executing validation workflow for %s", analysis_cid)
         
         # Step 1: Retrieve analysis from IPFS
         analysis_data = self.retrieve_evidence(analysis_cid, "analysis")
@@ -498,53 +844,33 @@ class ChaosChainAgentSDK:
             "validator_agent": self.agent_name,
             "server_agent_id": server_agent_id,
             "validation_payment": validation_payment,
-            "completed_at": datetime.now().isoformat()
+            "completed_at": self._now_iso()
         }
         
-        rprint(f"[green]✅ Validation workflow completed[/green]")
+        log.info("✅ Validation workflow completed")
         return workflow_result
-    
-    # === SDK Utilities ===
-    
-    def get_sdk_status(self) -> Dict[str, Any]:
-        """Get comprehensive SDK status"""
-        return {
-            "agent_info": {
-                "name": self.agent_name,
-                "domain": self.agent_domain,
-                "role": self.agent_role,
-                "agent_id": self.agent.agent_id,
-                "wallet_address": self.wallet_address
-            },
-            "network_info": {
-                "network": self.network,
-                "connected": True  # Simplified check
-            },
-            "component_status": {
-                "wallet_manager": bool(self.wallet_manager),
-                "ipfs_manager": bool(self.ipfs_manager),
-                "payment_manager": bool(self.payment_manager),
-                "agent": bool(self.agent)
-            },
-            "payment_stats": self.payment_manager.generate_payment_summary(),
-            "sdk_version": "1.0.0",
-            "generated_at": datetime.now().isoformat()
-        }
+
+
+_ROLE_SDK_CLASSES = {
+    "client": ClientSDK,
+    "server": ServerSDK,
+    "validator": ValidatorSDK,
+}
 
 
 # === SDK Factory Functions ===
 
-def create_client_agent(agent_name: str, agent_domain: str, network: str = "base-sepolia") -> ChaosChainAgentSDK:
+def create_client_agent(agent_name: str, agent_domain: str, network: str = "base-sepolia") -> ClientSDK:
     """Create a client agent SDK instance"""
-    return ChaosChainAgentSDK(agent_name, agent_domain, "client", network)
+    return ClientSDK(agent_name, agent_domain, "client", network)
 
-def create_server_agent(agent_name: str, agent_domain: str, network: str = "base-sepolia") -> ChaosChainAgentSDK:
+def create_server_agent(agent_name: str, agent_domain: str, network: str = "base-sepolia") -> ServerSDK:
     """Create a server agent SDK instance"""
-    return ChaosChainAgentSDK(agent_name, agent_domain, "server", network)
+    return ServerSDK(agent_name, agent_domain, "server", network)
 
-def create_validator_agent(agent_name: str, agent_domain: str, network: str = "base-sepolia") -> ChaosChainAgentSDK:
+def create_validator_agent(agent_name: str, agent_domain: str, network: str = "base-sepolia") -> ValidatorSDK:
     """Create a validator agent SDK instance"""
-    return ChaosChainAgentSDK(agent_name, agent_domain, "validator", network)
+    return ValidatorSDK(agent_name, agent_domain, "validator", network)
 
 
 # === Example Usage ===
@@ -5,28 +5,33 @@ This module provides beautiful, interactive command-line interface components
 using the Rich library for Genesis Studio operations.
 """
 
+import os
 import time
-from typing import Optional, List, Dict, Any
+import warnings
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Optional, List, Dict, Any, Tuple, TypeVar
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 from rich.text import Text
 from rich.align import Align
 from rich import print as rprint
-from rich.markdown import Markdown
+from dotenv import load_dotenv
+
+if TYPE_CHECKING:
+    from rich.progress import Progress
+
+load_dotenv()
 
 console = Console()
 
-class GenesisStudioCLI:
-    """Rich CLI interface for Genesis Studio operations"""
-    
-    def __init__(self):
-        self.console = console
-    
-    def print_banner(self):
-        """Display the Genesis Studio banner"""
-        banner_text = """
+T = TypeVar("T")
+
+# Explorer and gateway URL prefixes used in links, read once (override for mainnet/other gateways)
+_BASESCAN_TX = os.getenv("BASESCAN_URL", "https://sepolia.basescan.org").rstrip("/") + "/tx/"
+_PINATA_IPFS = os.getenv("PINATA_GATEWAY_URL", "https://gateway.pinata.cloud").rstrip("/") + "/ipfs/"
+
+_BANNER_TEXT = """
 # 🚀 CHAOSCHAIN GENESIS STUDIO
 ## ERC-8004 Commercial Prototype
 
@@ -35,17 +40,30 @@ class GenesisStudioCLI:
 - **Verifiable Work** with IPFS storage  
 - **Direct Payments** using USDC on Base Sepolia
 - **IP Monetization** through Story Protocol
-        """
-        
-        banner_panel = Panel(
-            Markdown(banner_text),
-            title="[bold cyan]Welcome to ChaosChain Genesis Studio[/bold cyan]",
-            border_style="cyan",
-            padding=(1, 2)
-        )
-        
+"""
+
+@lru_cache(maxsize=None)
+def _banner() -> Align:
+    """Centered banner panel, composed on first use (rich.markdown pulls in markdown-it)"""
+    from rich.markdown import Markdown
+    banner_panel = Panel(
+        Markdown(_BANNER_TEXT),
+        title="[bold cyan]Welcome to ChaosChain Genesis Studio[/bold cyan]",
+        border_style="cyan",
+        padding=(1, 2)
+    )
+    return Align.center(banner_panel)
+
+class GenesisStudioCLI:
+    """Rich CLI interface for Genesis Studio operations"""
+    
+    def __init__(self):
+        self.console = console
+    
+    def print_banner(self):
+        """Display the Genesis Studio banner"""
         self.console.print()
-        self.console.print(Align.center(banner_panel))
+        self.console.print(_banner())
         self.console.print()
     
     def print_phase_header(self, phase_num: int, phase_name: str, description: str):
@@ -83,26 +101,26 @@ class GenesisStudioCLI:
         
         self.console.print(f"{icon} [bold {color}]Step {step_num}:[/bold {color}] {description}")
     
-    def print_agent_registration(self, agent_name: str, agent_id: int, address: str, tx_hash: str):
-        """Display agent registration success"""
+    def _print_kv_panel(self, title: str, border_style: str, rows: List[Tuple[str, str]]):
+        """Print a bordered panel holding a two-column field/value table"""
         table = Table(show_header=False, box=None, padding=(0, 1))
         table.add_column("Field", style="cyan")
         table.add_column("Value", style="white")
+        for field, value in rows:
+            table.add_row(field, value)
         
-        table.add_row("Agent Name:", f"[bold green]{agent_name}[/bold green]")
-        table.add_row("Agent ID:", f"[bold yellow]{agent_id}[/bold yellow]")
-        table.add_row("Wallet Address:", f"[blue]{address}[/blue]")
-        table.add_row("Registration Tx:", f"[link=https://sepolia.basescan.org/tx/{tx_hash}]{tx_hash}[/link]")
-        
-        panel = Panel(
-            table,
-            title=f"[bold green]✅ {agent_name} Registered Successfully[/bold green]",
-            border_style="green"
-        )
-        
-        self.console.print(panel)
+        self.console.print(Panel(table, title=title, border_style=border_style))
         self.console.print()
     
+    def print_agent_registration(self, agent_name: str, agent_id: int, address: str, tx_hash: str):
+        """Display agent registration success"""
+        self._print_kv_panel(f"[bold green]✅ {agent_name} Registered Successfully[/bold green]", "green", [
+            ("Agent Name:", f"[bold green]{agent_name}[/bold green]"),
+            ("Agent ID:", f"[bold yellow]{agent_id}[/bold yellow]"),
+            ("Wallet Address:", f"[blue]{address}[/blue]"),
+            ("Registration Tx:", f"[link={_BASESCAN_TX}{tx_hash}]{tx_hash}[/link]"),
+        ])
+    
     def print_ipfs_upload(self, filename: str, cid: str, gateway_url: str):
         """Display IPFS upload success"""
         self.console.print(f"[green]📁 {filename} uploaded to IPFS[/green]")
@@ -112,79 +130,46 @@ class GenesisStudioCLI:
     
     def print_usdc_payment(self, from_agent: str, to_agent: str, amount: float, tx_hash: str):
         """Display USDC payment success"""
-        table = Table(show_header=False, box=None, padding=(0, 1))
-        table.add_column("Field", style="cyan")
-        table.add_column("Value", style="white")
-        
-        table.add_row("From:", f"[yellow]{from_agent}[/yellow]")
-        table.add_row("To:", f"[yellow]{to_agent}[/yellow]")
-        table.add_row("Amount:", f"[bold green]{amount} USDC[/bold green]")
-        table.add_row("Transaction:", f"[link=https://sepolia.basescan.org/tx/{tx_hash}]{tx_hash}[/link]")
-        
-        panel = Panel(
-            table,
-            title="[bold green]💸 USDC Payment Successful[/bold green]",
-            border_style="green"
-        )
-        
-        self.console.print(panel)
-        self.console.print()
+        self._print_kv_panel("[bold green]💸 USDC Payment Successful[/bold green]", "green", [
+            ("From:", f"[yellow]{from_agent}[/yellow]"),
+            ("To:", f"[yellow]{to_agent}[/yellow]"),
+            ("Amount:", f"[bold green]{amount} USDC[/bold green]"),
+            ("Transaction:", f"[link={_BASESCAN_TX}{tx_hash}]{tx_hash}[/link]"),
+        ])
     
     def print_x402_payment(self, from_agent: str, to_agent: str, amount: float, tx_hash: str, service_description: str):
         """Display x402 payment success"""
-        table = Table(show_header=False, box=None, padding=(0, 1))
-        table.add_column("Field", style="cyan")
-        table.add_column("Value", style="white")
-        
-        table.add_row("From:", f"[yellow]{from_agent}[/yellow]")
-        table.add_row("To:", f"[yellow]{to_agent}[/yellow]")
-        table.add_row("Amount:", f"[bold green]{amount} USDC[/bold green]")
-        table.add_row("Service:", f"[blue]{service_description}[/blue]")
-        table.add_row("Protocol:", f"[magenta]x402 (HTTP 402)[/magenta]")
-        table.add_row("Transaction:", f"[link=https://sepolia.basescan.org/tx/{tx_hash}]{tx_hash}[/link]")
-        table.add_row("Receipt:", f"[dim]✅ Cryptographic proof generated[/dim]")
-        
-        panel = Panel(
-            table,
-            title="[bold cyan]💳 x402 Payment Successful[/bold cyan]",
-            border_style="cyan"
-        )
-        
-        self.console.print(panel)
-        self.console.print()
+        self._print_kv_panel("[bold cyan]💳 x402 Payment Successful[/bold cyan]", "cyan", [
+            ("From:", f"[yellow]{from_agent}[/yellow]"),
+            ("To:", f"[yellow]{to_agent}[/yellow]"),
+            ("Amount:", f"[bold green]{amount} USDC[/bold green]"),
+            ("Service:", f"[blue]{service_description}[/blue]"),
+            ("Protocol:", f"[magenta]x402 (HTTP 402)[/magenta]"),
+            ("Transaction:", f"[link={_BASESCAN_TX}{tx_hash}]{tx_hash}[/link]"),
+            ("Receipt:", f"[dim]✅ Cryptographic proof generated[/dim]"),
+        ])
     
     def print_story_protocol_registration(self, title: str, asset_id: str, creator: str, story_url: str):
         """Display Story Protocol IP registration success"""
-        table = Table(show_header=False, box=None, padding=(0, 1))
-        table.add_column("Field", style="cyan")
-        table.add_column("Value", style="white")
-        
-        table.add_row("IP Title:", f"[bold white]{title}[/bold white]")
-        table.add_row("Asset ID:", f"[yellow]{asset_id}[/yellow]")
-        table.add_row("Creator:", f"[blue]{creator}[/blue]")
-        table.add_row("Story Protocol:", f"[link={story_url}]{story_url}[/link]")
-        
-        panel = Panel(
-            table,
-            title="[bold magenta]🎨 IP Asset Registered on Story Protocol[/bold magenta]",
-            border_style="magenta"
-        )
-        
-        self.console.print(panel)
-        self.console.print()
+        self._print_kv_panel("[bold magenta]🎨 IP Asset Registered on Story Protocol[/bold magenta]", "magenta", [
+            ("IP Title:", f"[bold white]{title}[/bold white]"),
+            ("Asset ID:", f"[yellow]{asset_id}[/yellow]"),
+            ("Creator:", f"[blue]{creator}[/blue]"),
+            ("Story Protocol:", f"[link={story_url}]{story_url}[/link]"),
+        ])
     
     def print_validation_request(self, validator_name: str, data_hash: str, tx_hash: str):
         """Display validation request"""
         self.console.print(f"[blue]🔍 Validation requested from {validator_name}[/blue]")
         self.console.print(f"   [dim]Data Hash:[/dim] {data_hash}")
-        self.console.print(f"   [dim]Transaction:[/dim] [link=https://sepolia.basescan.org/tx/{tx_hash}]{tx_hash}[/link]")
+        self.console.print(f"   [dim]Transaction:[/dim] [link={_BASESCAN_TX}{tx_hash}]{tx_hash}[/link]")
         self.console.print()
     
     def print_validation_response(self, validator_name: str, score: int, tx_hash: str):
         """Display validation response"""
         color = "green" if score >= 90 else "yellow" if score >= 70 else "red"
         self.console.print(f"[{color}]📊 Validation completed by {validator_name}: {score}/100[/{color}]")
-        self.console.print(f"   [dim]Transaction:[/dim] [link=https://sepolia.basescan.org/tx/{tx_hash}]{tx_hash}[/link]")
+        self.console.print(f"   [dim]Transaction:[/dim] [link={_BASESCAN_TX}{tx_hash}]{tx_hash}[/link]")
         self.console.print()
     
     def print_final_summary(self, summary_data: Dict[str, Any]):
@@ -230,31 +215,28 @@ class GenesisStudioCLI:
         if "Agent Registration" in summary_data:
             agent_data = summary_data["Agent Registration"]
             if agent_data.get("success") and "tx_hashes" in agent_data:
-                links.append("🤖 Agent Registrations:")
-                for agent, tx_hash in agent_data["tx_hashes"].items():
-                    links.append(f"   • {agent}: https://sepolia.basescan.org/tx/{tx_hash}")
+                agent_lines = "\n".join(f"   • {agent}: {_BASESCAN_TX}{tx_hash}" for agent, tx_hash in agent_data["tx_hashes"].items())
+                links.append(f"🤖 Agent Registrations:\n{agent_lines}")
         
         # IPFS uploads
         if "IPFS Storage" in summary_data:
             ipfs_data = summary_data["IPFS Storage"]
             if ipfs_data.get("success") and "cids" in ipfs_data:
-                links.append("\n📁 IPFS Files:")
-                for filename, cid in ipfs_data["cids"].items():
-                    links.append(f"   • {filename}: https://gateway.pinata.cloud/ipfs/{cid}")
+                ipfs_lines = "\n".join(f"   • {filename}: {_PINATA_IPFS}{cid}" for filename, cid in ipfs_data["cids"].items())
+                links.append(f"\n📁 IPFS Files:\n{ipfs_lines}")
         
         # USDC payment
         if "USDC Payment" in summary_data:
             payment_data = summary_data["USDC Payment"]
             if payment_data.get("success") and "tx_hash" in payment_data:
-                links.append(f"\n💸 USDC Payment: https://sepolia.basescan.org/tx/{payment_data['tx_hash']}")
+                links.append(f"\n💸 USDC Payment: {_BASESCAN_TX}{payment_data['tx_hash']}")
         
         # Story Protocol
         if "Story Protocol" in summary_data:
             story_data = summary_data["Story Protocol"]
             if story_data.get("success") and "asset_urls" in story_data:
-                links.append("\n🎨 Story Protocol IP Assets:")
-                for title, url in story_data["asset_urls"].items():
-                    links.append(f"   • {title}: {url}")
+                story_lines = "\n".join(f"   • {title}: {url}" for title, url in story_data["asset_urls"].items())
+                links.append(f"\n🎨 Story Protocol IP Assets:\n{story_lines}")
         
         return "\n".join(links) if links else "No links available"
     
@@ -283,8 +265,9 @@ class GenesisStudioCLI:
         self.console.print(f"[blue]ℹ️  Info:[/blue] {message}")
         self.console.print()
     
-    def create_progress_bar(self, description: str) -> Progress:
+    def create_progress_bar(self, description: str) -> "Progress":
         """Create a progress bar for long-running operations"""
+        from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
         return Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -293,7 +276,30 @@ class GenesisStudioCLI:
             console=self.console
         )
     
-    def wait_with_spinner(self, message: str, duration: float = 2.0):
-        """Display a spinner for a specified duration"""
+    def wait_with_spinner(self, message: str, work: Optional[Callable[[], T]] = None, duration: Optional[float] = None) -> Optional[T]:
+        """
+        Display a spinner while running a piece of work
+        
+        Args:
+            message: Status text shown next to the spinner
+            work: Callable to run while the spinner is shown
+            duration: Deprecated; sleeps for a fixed time instead of running work
+            
+        Returns:
+            The result of work (None when only a duration is given)
+        """
+        if work is not None and not callable(work):
+            # Old positional form: wait_with_spinner(message, 2.0)
+            work, duration = None, work
+        
         with self.console.status(f"[bold blue]{message}..."):
-            time.sleep(duration)
+            if work is not None:
+                return work()
+            if duration is not None:
+                warnings.warn(
+                    "wait_with_spinner(duration=...) only adds dead time; pass the work to run instead",
+                    DeprecationWarning,
+                    stacklevel=2
+                )
+                time.sleep(duration)
+        return None
@@ -4,19 +4,245 @@ Genesis Studio - IPFS Storage Module
 This module handles storing analysis reports and validation data on IPFS using Pinata.
 """
 
+import asyncio
+import io
 import os
 import json
+import re
+import copy
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 import requests
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
 from rich.console import Console
 from rich import print as rprint
 
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:  # optional; large uploads are then encoded in memory
+    MultipartEncoder = None
+
 console = Console()
 
+# Shared pool for concurrent uploads and prefetches (IPFS traffic is network-bound)
+IPFS_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="genesis-ipfs")
+
+# Payloads at least this large are streamed as multipart instead of encoded in memory
+STREAMING_UPLOAD_THRESHOLD = 64 * 1024
+
+# Seconds to wait on the Pinata API or gateway, for the connection and between response bytes
+IPFS_REQUEST_TIMEOUT = 30
+
+# Rate limiting and transient gateway errors, retried with exponential backoff
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# Attempts for a streamed upload, which upload_json retries itself
+STREAMING_UPLOAD_ATTEMPTS = 5
+
+# Keep-alive sessions shared by all Pinata API and gateway requests, created on first use
+_ipfs_session: Optional[requests.Session] = None
+_ipfs_stream_session: Optional[requests.Session] = None
+_ipfs_session_lock = threading.Lock()
+
+
+def _new_session(retry_methods: frozenset) -> requests.Session:
+    """Pooled session retrying RETRY_STATUSES for the given HTTP methods (connection errors always)"""
+    session = requests.Session()
+    retries = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=retry_methods,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_ipfs_session() -> requests.Session:
+    """
+    Get the process-wide HTTP session for IPFS traffic
+    
+    Pooled connections to the Pinata API and gateway are reused across uploads
+    and retrievals, so each request skips the DNS lookup and TCP+TLS handshake.
+    The pool is sized to cover every IPFS_EXECUTOR worker. Rate limiting and
+    transient gateway errors (429/502/503/504) are retried with exponential
+    backoff; other 4xx responses fail fast.
+    """
+    global _ipfs_session
+    if _ipfs_session is None:
+        with _ipfs_session_lock:
+            if _ipfs_session is None:
+                # Pinning is content-addressed, so re-sending an upload POST is safe
+                _ipfs_session = _new_session(frozenset({"GET", "POST"}))
+    return _ipfs_session
+
+
+def get_ipfs_stream_session() -> requests.Session:
+    """
+    Get the process-wide HTTP session for streamed (MultipartEncoder) uploads
+    
+    urllib3 can't rewind a MultipartEncoder body, so a status retry would
+    re-send a drained body under the original Content-Length. This session
+    only retries connection errors (raised before any body is sent);
+    upload_json retries the statuses itself with a fresh encoder.
+    """
+    global _ipfs_stream_session
+    if _ipfs_stream_session is None:
+        with _ipfs_session_lock:
+            if _ipfs_stream_session is None:
+                _ipfs_stream_session = _new_session(frozenset({"GET"}))
+    return _ipfs_stream_session
+
+
+def _status(message: str):
+    """Spinner for the main thread; Rich allows only one live display, so workers run silently"""
+    if threading.current_thread() is threading.main_thread():
+        return console.status(message)
+    return nullcontext()
+
+
+def serialize_json(data: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """
+    Serialize data to UTF-8 JSON bytes, using orjson when it is installed
+    
+    Args:
+        data: JSON-compatible data (dataclasses and datetimes are accepted with orjson)
+        indent: Pretty-print with two-space indentation
+        sort_keys: Emit object keys in sorted order, e.g. for cache keys (the
+            bytes differ between orjson and the stdlib encoder, so don't use
+            this for hashes other agents must reproduce)
+        
+    Returns:
+        Encoded JSON document
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(data, option=option)
+        except TypeError:
+            # e.g. integers wider than 64 bits; the stdlib encoder handles those
+            pass
+    return json.dumps(data, indent=2 if indent else None, sort_keys=sort_keys).encode()
+
+
+# Digit runs long enough to hold an integer outside orjson's 64-bit range (e.g. wei amounts)
+_LONG_DIGITS = re.compile(r"\d{19}")
+_LONG_DIGITS_BYTES = re.compile(rb"\d{19}")
+
+
+def deserialize_json(content: Union[bytes, str]) -> Any:
+    """
+    Parse a JSON document, using orjson when it is installed
+    
+    orjson decodes integers outside the 64-bit range as floats, losing
+    precision, so documents with 19+ digit runs go to the stdlib parser
+    (mirroring serialize_json's fallback for those integers).
+    """
+    if orjson is not None:
+        long_digits = _LONG_DIGITS_BYTES if isinstance(content, (bytes, bytearray, memoryview)) else _LONG_DIGITS
+        if not long_digits.search(content):
+            return orjson.loads(content)
+    return json.loads(content)
+
+class _CIDCache:
+    """
+    Bounded LRU cache of IPFS JSON documents keyed by CID
+    
+    CIDs are content-addressed, so a cached document never goes stale.
+    Entries are also persisted to ~/.chaoschain/cache/<cid>.json for reuse
+    across runs; set CHAOSCHAIN_NO_CACHE=1 to bypass the cache entirely.
+    """
+    
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self.enabled = os.getenv("CHAOSCHAIN_NO_CACHE", "").lower() not in ("1", "true", "yes")
+        self.cache_dir = os.path.join(os.path.expanduser("~"), ".chaoschain", "cache")
+        self._entries: "OrderedDict[str, Dict[Any, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, cid: str) -> Optional[Dict[Any, Any]]:
+        """Return a copy of the cached document for a CID, or None"""
+        if not self.enabled:
+            return None
+        
+        with self._lock:
+            data = self._entries.get(cid)
+            if data is not None:
+                self._entries.move_to_end(cid)
+                return copy.deepcopy(data)
+        
+        try:
+            with open(self._disk_path(cid), 'rb') as f:
+                data = deserialize_json(f.read())
+        except (OSError, ValueError):
+            return None
+        
+        self._remember(cid, data)
+        return copy.deepcopy(data)
+    
+    def __contains__(self, cid: str) -> bool:
+        """Whether a CID is cached in memory or on disk, without reading or copying the document"""
+        if not self.enabled:
+            return False
+        with self._lock:
+            if cid in self._entries:
+                return True
+        return os.path.exists(self._disk_path(cid))
+    
+    def put(self, cid: str, data: Dict[Any, Any], content: Optional[bytes] = None):
+        """Cache the document stored under a CID (memory and disk); content is its JSON encoding, if already known"""
+        if not self.enabled or not cid:
+            return
+        
+        self._remember(cid, copy.deepcopy(data))
+        
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self._disk_path(cid)}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(content if content is not None else serialize_json(data))
+            os.replace(tmp_path, self._disk_path(cid))
+        except (OSError, TypeError, ValueError):
+            pass
+    
+    def _remember(self, cid: str, data: Dict[Any, Any]):
+        """Insert into the in-memory LRU, evicting the oldest entries"""
+        with self._lock:
+            self._entries[cid] = data
+            self._entries.move_to_end(cid)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def _disk_path(self, cid: str) -> str:
+        """On-disk cache file for a CID"""
+        return os.path.join(self.cache_dir, f"{os.path.basename(cid)}.json")
+
+
 class PinataIPFSStorage:
     """Handles IPFS storage operations via Pinata API"""
     
-    def __init__(self):
+    # Shared by all storage instances in the process
+    cache = _CIDCache()
+    
+    def __init__(self, session: Optional[requests.Session] = None,
+                 stream_session: Optional[requests.Session] = None):
         self.jwt_token = os.getenv("PINATA_JWT")
         self.gateway_url = os.getenv("PINATA_GATEWAY")
         
@@ -26,42 +252,66 @@ class PinataIPFSStorage:
             raise ValueError("PINATA_GATEWAY environment variable is required")
         
         self.base_url = "https://api.pinata.cloud"
+        self.gateway_prefix = f"https://{self.gateway_url}/ipfs/"
+        self.session = session or get_ipfs_session()
+        self.stream_session = stream_session or get_ipfs_stream_session()
         self.headers = {
             "Authorization": f"Bearer {self.jwt_token}",
             "Content-Type": "application/json"
         }
+        # File uploads are multipart, so requests sets the Content-Type itself
+        self.upload_headers = {
+            "Authorization": f"Bearer {self.jwt_token}"
+        }
     
-    def upload_json(self, data: Dict[Any, Any], filename: str) -> Optional[str]:
-        """Upload JSON data to IPFS and return the CID"""
+    def upload_json(self, data: Union[Dict[Any, Any], bytes], filename: str) -> Optional[str]:
+        """Upload JSON data (a dict or pre-serialized bytes) to IPFS and return the CID"""
         
         try:
-            # Convert data to JSON string
-            json_content = json.dumps(data, indent=2)
-            
-            # Prepare the file for upload
-            files = {
-                'file': (filename, json_content, 'application/json')
-            }
-            
-            # Remove Content-Type header for file upload
-            upload_headers = {
-                "Authorization": f"Bearer {self.jwt_token}"
-            }
+            # Convert data to JSON bytes (already-serialized payloads are sent as-is)
+            json_content = data if isinstance(data, bytes) else serialize_json(data, indent=True)
             
-            with console.status(f"[bold blue]Uploading {filename} to IPFS..."):
-                response = requests.post(
-                    f"{self.base_url}/pinning/pinFileToIPFS",
-                    files=files,
-                    headers=upload_headers
-                )
+            with _status(f"[bold blue]Uploading {filename} to IPFS..."):
+                if MultipartEncoder is not None and len(json_content) >= STREAMING_UPLOAD_THRESHOLD:
+                    # Stream the multipart body from the payload instead of building a second copy
+                    for attempt in range(STREAMING_UPLOAD_ATTEMPTS):
+                        if attempt:
+                            time.sleep(0.5 * 2 ** attempt)
+                        # A fresh encoder per attempt; a sent one is drained and can't be rewound
+                        encoder = MultipartEncoder(fields={
+                            'file': (filename, io.BytesIO(json_content), 'application/json')
+                        })
+                        response = self.stream_session.post(
+                            f"{self.base_url}/pinning/pinFileToIPFS",
+                            data=encoder,
+                            headers={**self.upload_headers, "Content-Type": encoder.content_type},
+                            timeout=IPFS_REQUEST_TIMEOUT
+                        )
+                        if response.status_code not in RETRY_STATUSES:
+                            break
+                else:
+                    # Prepare the file for upload
+                    files = {
+                        'file': (filename, json_content, 'application/json')
+                    }
+                    response = self.session.post(
+                        f"{self.base_url}/pinning/pinFileToIPFS",
+                        files=files,
+                        headers=self.upload_headers,
+                        timeout=IPFS_REQUEST_TIMEOUT
+                    )
             
             if response.status_code == 200:
-                result = response.json()
+                result = deserialize_json(response.content)
                 cid = result.get("IpfsHash")
                 
+                # We know exactly what this CID resolves to; later retrievals skip the gateway
+                # Cached as parsed back from the uploaded bytes, so it matches what the gateway returns
+                self.cache.put(cid, deserialize_json(json_content), json_content)
+                
                 rprint(f"[green]📁 Successfully uploaded {filename} to IPFS")
                 rprint(f"[blue]   CID: {cid}")
-                rprint(f"[blue]   Gateway URL: https://{self.gateway_url}/ipfs/{cid}")
+                rprint(f"[blue]   Gateway URL: {self.gateway_prefix}{cid}")
                 
                 return cid
             else:
@@ -72,17 +322,47 @@ class PinataIPFSStorage:
             rprint(f"[red]❌ Error uploading {filename}: {e}")
             return None
     
+    async def upload_json_async(self, data: Union[Dict[Any, Any], bytes], filename: str) -> Optional[str]:
+        """Async variant of upload_json; the request runs on a worker thread over the pooled session"""
+        return await asyncio.to_thread(self.upload_json, data, filename)
+    
+    def upload_json_many(self, items: Sequence[Tuple[Union[Dict[Any, Any], bytes], str]]) -> List[Optional[str]]:
+        """
+        Upload several JSON documents concurrently
+        
+        All uploads are submitted to IPFS_EXECUTOR up front and their CIDs
+        collected as they complete, so K independent uploads take about one
+        round trip instead of K.
+        
+        Args:
+            items: (data, filename) pairs, as for upload_json
+            
+        Returns:
+            CIDs in input order (None for failed uploads)
+        """
+        futures = [IPFS_EXECUTOR.submit(self.upload_json, data, filename) for data, filename in items]
+        return [future.result() for future in futures]
+    
+    async def upload_json_many_async(self, items: Sequence[Tuple[Union[Dict[Any, Any], bytes], str]]) -> List[Optional[str]]:
+        """Async variant of upload_json_many"""
+        return list(await asyncio.gather(*[self.upload_json_async(data, filename) for data, filename in items]))
+    
     def retrieve_json(self, cid: str) -> Optional[Dict[Any, Any]]:
         """Retrieve JSON data from IPFS using CID"""
         
+        cached = self.cache.get(cid)
+        if cached is not None:
+            return cached
+        
         try:
-            gateway_url = f"https://{self.gateway_url}/ipfs/{cid}"
+            gateway_url = self.gateway_prefix + cid
             
-            with console.status(f"[bold blue]Retrieving data from IPFS..."):
-                response = requests.get(gateway_url)
+            with _status(f"[bold blue]Retrieving data from IPFS..."):
+                response = self.session.get(gateway_url, timeout=IPFS_REQUEST_TIMEOUT)
             
             if response.status_code == 200:
-                data = response.json()
+                data = deserialize_json(response.content)
+                self.cache.put(cid, data, response.content)
                 rprint(f"[green]📥 Successfully retrieved data from IPFS")
                 rprint(f"[blue]   CID: {cid}")
                 return data
@@ -94,21 +374,36 @@ class PinataIPFSStorage:
             rprint(f"[red]❌ Error retrieving data: {e}")
             return None
     
+    def prefetch(self, cids: List[str]):
+        """
+        Fetch several CIDs concurrently into the cache
+        
+        Later retrieve_json calls for these CIDs are served from memory, so
+        reading N documents costs about one gateway round trip instead of N.
+        A no-op with CHAOSCHAIN_NO_CACHE set, since nothing would be kept.
+        """
+        if not self.cache.enabled:
+            return
+        missing = [cid for cid in dict.fromkeys(cids) if cid and cid not in self.cache]
+        for future in [IPFS_EXECUTOR.submit(self.retrieve_json, cid) for cid in missing]:
+            future.result()
+    
     def get_gateway_url(self, cid: str) -> str:
         """Get the full gateway URL for a CID"""
-        return f"https://{self.gateway_url}/ipfs/{cid}"
+        return self.gateway_prefix + cid
     
     def pin_status(self, cid: str) -> Optional[Dict[str, Any]]:
         """Check the pin status of a CID"""
         
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/data/pinList?hashContains={cid}",
-                headers=self.headers
+                headers=self.headers,
+                timeout=IPFS_REQUEST_TIMEOUT
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = deserialize_json(response.content)
                 return result
             else:
                 rprint(f"[red]❌ Failed to check pin status: {response.text}")
@@ -121,11 +416,47 @@ class PinataIPFSStorage:
 class GenesisIPFSManager:
     """High-level IPFS manager for Genesis Studio operations"""
     
-    def __init__(self):
-        self.storage = PinataIPFSStorage()
+    def __init__(self, session: Optional[requests.Session] = None,
+                 stream_session: Optional[requests.Session] = None):
+        self.storage = PinataIPFSStorage(session, stream_session)
     
     def store_analysis_report(self, analysis_data: Dict[str, Any], agent_id: int) -> Optional[str]:
         """Store market analysis report on IPFS"""
+        return self.storage.upload_json(*self._analysis_report(analysis_data, agent_id))
+    
+    def store_validation_report(self, validation_data: Dict[str, Any], validator_id: int, data_hash: str) -> Optional[str]:
+        """Store validation report on IPFS"""
+        return self.storage.upload_json(*self._validation_report(validation_data, validator_id, data_hash))
+    
+    async def store_reports_batch(
+        self,
+        analysis_reports: Sequence[Tuple[Dict[str, Any], int]] = (),
+        validation_reports: Sequence[Tuple[Dict[str, Any], int, str]] = ()
+    ) -> List[Optional[str]]:
+        """
+        Store several analysis and validation reports concurrently
+        
+        Args:
+            analysis_reports: (analysis_data, agent_id) pairs
+            validation_reports: (validation_data, validator_id, data_hash) triples
+            
+        Returns:
+            CIDs (None for failed uploads), analysis reports first, in input order
+        """
+        uploads = [self._analysis_report(*args) for args in analysis_reports]
+        uploads += [self._validation_report(*args) for args in validation_reports]
+        return await self.storage.upload_json_many_async(uploads)
+    
+    def store_analysis_reports(self, reports: Sequence[Tuple[Dict[str, Any], int]]) -> List[Optional[str]]:
+        """Store several analysis reports concurrently; takes (analysis_data, agent_id) pairs"""
+        return self.storage.upload_json_many([self._analysis_report(*args) for args in reports])
+    
+    def store_validation_reports(self, reports: Sequence[Tuple[Dict[str, Any], int, str]]) -> List[Optional[str]]:
+        """Store several validation reports concurrently; takes (validation_data, validator_id, data_hash) triples"""
+        return self.storage.upload_json_many([self._validation_report(*args) for args in reports])
+    
+    def _analysis_report(self, analysis_data: Dict[str, Any], agent_id: int) -> Tuple[Dict[str, Any], str]:
+        """Wrap analysis data in report metadata; returns (report, filename)"""
         
         # Add metadata
         report = {
@@ -137,10 +468,10 @@ class GenesisIPFSManager:
         }
         
         filename = f"analysis_agent_{agent_id}_{analysis_data.get('timestamp', 'unknown')}.json"
-        return self.storage.upload_json(report, filename)
+        return report, filename
     
-    def store_validation_report(self, validation_data: Dict[str, Any], validator_id: int, data_hash: str) -> Optional[str]:
-        """Store validation report on IPFS"""
+    def _validation_report(self, validation_data: Dict[str, Any], validator_id: int, data_hash: str) -> Tuple[Dict[str, Any], str]:
+        """Wrap validation data in report metadata; returns (report, filename)"""
         
         # Add metadata
         report = {
@@ -153,7 +484,7 @@ class GenesisIPFSManager:
         }
         
         filename = f"validation_agent_{validator_id}_{data_hash[:8]}.json"
-        return self.storage.upload_json(report, filename)
+        return report, filename
     
     def retrieve_analysis_report(self, cid: str) -> Optional[Dict[str, Any]]:
         """Retrieve and validate analysis report from IPFS"""
@@ -173,6 +504,14 @@ class GenesisIPFSManager:
     
     def store_generic_evidence(self, evidence_data: Dict[str, Any], agent_id: int, evidence_type: str) -> Optional[str]:
         """Store generic evidence on IPFS"""
+        return self.storage.upload_json(*self._generic_evidence_report(evidence_data, agent_id, evidence_type))
+    
+    def store_generic_evidence_many(self, items: Sequence[Tuple[Dict[str, Any], int, str]]) -> List[Optional[str]]:
+        """Store several pieces of generic evidence concurrently; takes (evidence_data, agent_id, evidence_type) triples"""
+        return self.storage.upload_json_many([self._generic_evidence_report(*args) for args in items])
+    
+    def _generic_evidence_report(self, evidence_data: Dict[str, Any], agent_id: int, evidence_type: str) -> Tuple[Dict[str, Any], str]:
+        """Wrap generic evidence in report metadata; returns (report, filename)"""
         
         # Add metadata
         report = {
@@ -185,7 +524,7 @@ class GenesisIPFSManager:
         }
         
         filename = f"evidence_{evidence_type}_agent_{agent_id}_{evidence_data.get('timestamp', 'unknown')}.json"
-        return self.storage.upload_json(report, filename)
+        return report, filename
     
     def retrieve_generic_evidence(self, cid: str) -> Optional[Dict[str, Any]]:
         """Retrieve generic evidence from IPFS"""
@@ -195,6 +534,10 @@ class GenesisIPFSManager:
             return data
         return None
     
+    def prefetch(self, cids: List[str]):
+        """Fetch several CIDs concurrently so subsequent retrievals hit the cache"""
+        self.storage.prefetch(cids)
+    
     def get_clickable_link(self, cid: str) -> str:
         """Get a clickable IPFS gateway link"""
         return self.storage.get_gateway_url(cid)
@@ -0,0 +1,54 @@
+"""
+Genesis Studio - Logging Utilities
+
+This module configures the loggers used on the agents' hot paths in place of
+unconditional rich printing.
+"""
+
+import logging
+import os
+import sys
+
+
+def _pretty_output() -> bool:
+    """
+    Whether to format log output with Rich
+    
+    Defaults to Rich on an interactive terminal and plain lines otherwise
+    (CI/headless runs); CHAOSCHAIN_PRETTY=1 or =0 forces either way.
+    """
+    pretty = os.getenv("CHAOSCHAIN_PRETTY", "").lower()
+    if pretty:
+        return pretty in ("1", "true", "yes")
+    return sys.stderr.isatty()
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Get a logger that prints bare status lines at INFO level
+
+    A RichHandler (no time, level or path columns, so output reads like the
+    previous rich prints) is attached when pretty output is enabled (see
+    _pretty_output); otherwise records go to a plain StreamHandler. Records
+    don't propagate, so they aren't printed a second time once the
+    application configures the root logger. Messages should use lazy
+    %-style arguments so filtered records cost nothing to format.
+
+    Args:
+        name: Logger name, normally the calling module's __name__
+
+    Returns:
+        Configured logger
+    """
+    log = logging.getLogger(name)
+    if not log.handlers:
+        if _pretty_output():
+            from rich.logging import RichHandler
+            handler = RichHandler(show_time=False, show_level=False, show_path=False)
+        else:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(handler)
+        log.setLevel(logging.INFO)
+        log.propagate = False
+    return log
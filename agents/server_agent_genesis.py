@@ -6,22 +6,106 @@ It uses CrewAI to perform market analysis tasks and integrates with
 Genesis Studio's wallet management and IPFS storage.
 """
 
+import copy
 import hashlib
 import json
+import os
+import time
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from crewai import Agent, Task, Crew
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 from rich import print as rprint
 
 from .base_agent_genesis import GenesisBaseAgent
+from .ipfs_storage import deserialize_json, serialize_json
+
+# Canonical encoder for data hashes; reused so each hash doesn't build a new JSONEncoder
+_CANONICAL_JSON = json.JSONEncoder(sort_keys=True)
 
 class MarketAnalysisInput(BaseModel):
     """Input model for market analysis"""
     symbol: str = Field(description="Trading symbol to analyze (e.g., 'BTC', 'ETH')")
     timeframe: str = Field(description="Analysis timeframe (e.g., '1d', '1w', '1m')")
 
+def _analysis_template(is_btc: bool) -> Dict[str, Any]:
+    """Static part of a market analysis (everything except symbol, timeframe and timestamp)"""
+    return {
+        "price_analysis": {
+            "current_price": 67500.00 if is_btc else 3200.00,
+            "24h_change": 2.34 if is_btc else -1.12,
+            "volume_24h": "28.5B" if is_btc else "12.8B",
+            "market_cap": "1.33T" if is_btc else "385B"
+        },
+        "technical_analysis": {
+            "trend": "Bullish" if is_btc else "Neutral",
+            "support_levels": [65000, 62000, 58000] if is_btc else [3100, 2950, 2800],
+            "resistance_levels": [70000, 73000, 76000] if is_btc else [3350, 3500, 3650],
+            "rsi": 58.7 if is_btc else 45.2,
+            "macd": "Bullish crossover" if is_btc else "Neutral",
+            "moving_averages": {
+                "ma_20": 66200 if is_btc else 3180,
+                "ma_50": 64800 if is_btc else 3150,
+                "ma_200": 61500 if is_btc else 3050
+            }
+        },
+        "sentiment_analysis": {
+            "fear_greed_index": 72 if is_btc else 55,
+            "social_sentiment": "Positive" if is_btc else "Neutral",
+            "news_sentiment": "Bullish" if is_btc else "Mixed"
+        },
+        "recommendations": {
+            "short_term": "Hold with potential for upside" if is_btc else "Neutral, watch for breakout",
+            "medium_term": "Bullish outlook maintained" if is_btc else "Cautiously optimistic",
+            "risk_level": "Medium" if is_btc else "Medium-High",
+            "entry_points": [66000, 64500] if is_btc else [3150, 3100],
+            "exit_targets": [72000, 76000] if is_btc else [3400, 3600]
+        },
+        "genesis_studio_metadata": {
+            "analysis_version": "1.0.0",
+            "confidence_score": 87 if is_btc else 73,
+            "data_sources": ["Technical Indicators", "Sentiment Analysis", "Market Structure"],
+            "methodology": "Multi-factor quantitative analysis with sentiment overlay"
+        }
+    }
+
+# Analysis values only depend on whether the symbol is BTC, so both variants are built once
+_BTC_TEMPLATE = _analysis_template(True)
+_DEFAULT_TEMPLATE = _analysis_template(False)
+
+# The templates are a fixed schema, so their indented JSON is also encoded once; _run
+# only encodes the per-call fields and splices them in front (drops the opening "{\n")
+_BTC_TEMPLATE_JSON = serialize_json(_BTC_TEMPLATE, indent=True).decode()[2:]
+_DEFAULT_TEMPLATE_JSON = serialize_json(_DEFAULT_TEMPLATE, indent=True).decode()[2:]
+
+# Crew task description; only the symbol varies between runs
+_ANALYSIS_TASK_TEMPLATE = """
+            Perform a comprehensive market analysis for {symbol} with the following requirements:
+            
+            1. Technical Analysis:
+               - Current price action and trends
+               - Support and resistance levels
+               - Key technical indicators (RSI, MACD, Moving Averages)
+               
+            2. Market Structure:
+               - Volume analysis
+               - Market cap considerations
+               - Liquidity assessment
+               
+            3. Sentiment Analysis:
+               - Fear & Greed Index interpretation
+               - Social media sentiment
+               - News sentiment analysis
+               
+            4. Trading Recommendations:
+               - Short-term and medium-term outlook
+               - Entry and exit points
+               - Risk assessment
+               
+            Provide actionable insights with specific price levels and confidence scores.
+            """
+
 class GenesisMarketAnalysisTool(BaseTool):
     """Enhanced market analysis tool for Genesis Studio"""
     name: str = "genesis_market_analysis"
@@ -31,59 +115,46 @@ class GenesisMarketAnalysisTool(BaseTool):
     def _run(self, symbol: str, timeframe: str) -> str:
         """
         Perform enhanced market analysis for Genesis Studio
+        
+        Returns the same document as serializing analyze(), without re-encoding
+        the static sections.
         """
+        body = _BTC_TEMPLATE_JSON if symbol == "BTC" else _DEFAULT_TEMPLATE_JSON
+        header = ",\n".join(
+            f'  "{key}": {serialize_json(value).decode()}'
+            for key, value in (("symbol", symbol), ("timeframe", timeframe), ("timestamp", datetime.now().isoformat()))
+        )
+        return f"{{\n{header},\n{body}"
+    
+    def analyze(self, symbol: str, timeframe: str, timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build the market analysis as a dict (what _run returns, before JSON encoding)
         
-        # Enhanced analysis with more comprehensive data
-        analysis = {
+        timestamp defaults to now.
+        """
+        template = _BTC_TEMPLATE if symbol == "BTC" else _DEFAULT_TEMPLATE
+        return {
             "symbol": symbol,
             "timeframe": timeframe,
-            "timestamp": datetime.now().isoformat(),
-            "price_analysis": {
-                "current_price": 67500.00 if symbol == "BTC" else 3200.00,
-                "24h_change": 2.34 if symbol == "BTC" else -1.12,
-                "volume_24h": "28.5B" if symbol == "BTC" else "12.8B",
-                "market_cap": "1.33T" if symbol == "BTC" else "385B"
-            },
-            "technical_analysis": {
-                "trend": "Bullish" if symbol == "BTC" else "Neutral",
-                "support_levels": [65000, 62000, 58000] if symbol == "BTC" else [3100, 2950, 2800],
-                "resistance_levels": [70000, 73000, 76000] if symbol == "BTC" else [3350, 3500, 3650],
-                "rsi": 58.7 if symbol == "BTC" else 45.2,
-                "macd": "Bullish crossover" if symbol == "BTC" else "Neutral",
-                "moving_averages": {
-                    "ma_20": 66200 if symbol == "BTC" else 3180,
-                    "ma_50": 64800 if symbol == "BTC" else 3150,
-                    "ma_200": 61500 if symbol == "BTC" else 3050
-                }
-            },
-            "sentiment_analysis": {
-                "fear_greed_index": 72 if symbol == "BTC" else 55,
-                "social_sentiment": "Positive" if symbol == "BTC" else "Neutral",
-                "news_sentiment": "Bullish" if symbol == "BTC" else "Mixed"
-            },
-            "recommendations": {
-                "short_term": "Hold with potential for upside" if symbol == "BTC" else "Neutral, watch for breakout",
-                "medium_term": "Bullish outlook maintained" if symbol == "BTC" else "Cautiously optimistic",
-                "risk_level": "Medium" if symbol == "BTC" else "Medium-High",
-                "entry_points": [66000, 64500] if symbol == "BTC" else [3150, 3100],
-                "exit_targets": [72000, 76000] if symbol == "BTC" else [3400, 3600]
-            },
-            "genesis_studio_metadata": {
-                "analysis_version": "1.0.0",
-                "confidence_score": 87 if symbol == "BTC" else 73,
-                "data_sources": ["Technical Indicators", "Sentiment Analysis", "Market Structure"],
-                "methodology": "Multi-factor quantitative analysis with sentiment overlay"
-            }
+            "timestamp": timestamp or datetime.now().isoformat(),
+            **copy.deepcopy(template)
         }
-        
-        return json.dumps(analysis, indent=2)
 
 class GenesisServerAgent(GenesisBaseAgent):
     """Enhanced Server Agent for Genesis Studio"""
     
+    # Analyses for the same symbol/timeframe are reused within this window instead of re-running the crew
+    ANALYSIS_CACHE_SECONDS = 60
+    
+    # CrewAI's verbose tracing is slow on terminal-bound runs; opt in with CHAOSCHAIN_CREW_VERBOSE=1
+    CREW_VERBOSE = os.getenv("CHAOSCHAIN_CREW_VERBOSE", "").lower() in ("1", "true", "yes")
+    
     def __init__(self, agent_domain: str, wallet_address: str, wallet_manager=None):
         super().__init__(agent_domain, wallet_address, wallet_manager)
         
+        # (symbol, timeframe, time bucket) -> analysis; only the current bucket is kept
+        self._analysis_cache: Dict[Tuple[str, str, int], Dict[str, Any]] = {}
+        
         # Initialize CrewAI components
         self._setup_crewai_agent()
         
@@ -106,10 +177,28 @@ class GenesisServerAgent(GenesisBaseAgent):
             sentiment analysis, and market structure. Your analyses are known for their accuracy 
             and comprehensive coverage of multiple market factors.""",
             tools=[self.analysis_tool],
-            verbose=True,
+            verbose=self.CREW_VERBOSE,
             allow_delegation=False
         )
     
+    def _crew_for(self, symbol: str) -> Crew:
+        """
+        Crew running the market analysis task for a symbol
+        
+        Built for every kickoff: a Task keeps the output of its last run, so it
+        isn't reused. The agent (and its tool) is shared across crews.
+        """
+        analysis_task = Task(
+            description=_ANALYSIS_TASK_TEMPLATE.format(symbol=symbol),
+            expected_output="A comprehensive JSON-formatted market analysis report",
+            agent=self.crew_agent
+        )
+        return Crew(
+            agents=[self.crew_agent],
+            tasks=[analysis_task],
+            verbose=self.CREW_VERBOSE
+        )
+    
     def generate_market_analysis(self, symbol: str, timeframe: str = "1d") -> Dict[str, Any]:
         """
         Generate comprehensive market analysis using CrewAI
@@ -122,45 +211,18 @@ class GenesisServerAgent(GenesisBaseAgent):
             Dictionary containing the analysis results
         """
         
+        cache_key = (symbol, timeframe, int(time.time() // self.ANALYSIS_CACHE_SECONDS))
+        cached = self._analysis_cache.get(cache_key)
+        if cached is not None:
+            rprint(f"[green]✅ Reusing market analysis for {symbol} from the last {self.ANALYSIS_CACHE_SECONDS}s[/green]")
+            return copy.deepcopy(cached)
+        
         rprint(f"[yellow]📊 Generating market analysis for {symbol}...[/yellow]")
         
-        # Create analysis task
-        analysis_task = Task(
-            description=f"""
-            Perform a comprehensive market analysis for {symbol} with the following requirements:
-            
-            1. Technical Analysis:
-               - Current price action and trends
-               - Support and resistance levels
-               - Key technical indicators (RSI, MACD, Moving Averages)
-               
-            2. Market Structure:
-               - Volume analysis
-               - Market cap considerations
-               - Liquidity assessment
-               
-            3. Sentiment Analysis:
-               - Fear & Greed Index interpretation
-               - Social media sentiment
-               - News sentiment analysis
-               
-            4. Trading Recommendations:
-               - Short-term and medium-term outlook
-               - Entry and exit points
-               - Risk assessment
-               
-            Provide actionable insights with specific price levels and confidence scores.
-            """,
-            expected_output="A comprehensive JSON-formatted market analysis report",
-            agent=self.crew_agent
-        )
+        crew = self._crew_for(symbol)
         
-        # Create crew and execute
-        crew = Crew(
-            agents=[self.crew_agent],
-            tasks=[analysis_task],
-            verbose=True
-        )
+        # One timestamp for the whole run (tool fallback and Genesis Studio metadata)
+        timestamp = datetime.now().isoformat()
         
         try:
             # Execute the analysis
@@ -169,20 +231,20 @@ class GenesisServerAgent(GenesisBaseAgent):
             # Parse the result
             if isinstance(result, str):
                 try:
-                    analysis_data = json.loads(result)
+                    analysis_data = deserialize_json(result)
                 except json.JSONDecodeError:
                     # Fallback to tool-generated analysis
-                    analysis_data = json.loads(self.analysis_tool._run(symbol, timeframe))
+                    analysis_data = self.analysis_tool.analyze(symbol, timeframe, timestamp)
             else:
                 # Fallback to tool-generated analysis
-                analysis_data = json.loads(self.analysis_tool._run(symbol, timeframe))
+                analysis_data = self.analysis_tool.analyze(symbol, timeframe, timestamp)
             
             # Add Genesis Studio metadata
             analysis_data.update({
                 "genesis_studio": {
                     "agent_id": self.agent_id,
                     "agent_domain": self.agent_domain,
-                    "analysis_timestamp": datetime.now().isoformat(),
+                    "analysis_timestamp": timestamp,
                     "version": "1.0.0"
                 }
             })
@@ -190,6 +252,10 @@ class GenesisServerAgent(GenesisBaseAgent):
             rprint(f"[green]✅ Market analysis completed for {symbol}[/green]")
             rprint(f"[blue]   Confidence Score: {analysis_data.get('genesis_studio_metadata', {}).get('confidence_score', 'N/A')}%[/blue]")
             
+            # Entries from older buckets can never be hit again
+            self._analysis_cache = {key: value for key, value in self._analysis_cache.items() if key[2] == cache_key[2]}
+            self._analysis_cache[cache_key] = copy.deepcopy(analysis_data)
+            
             return analysis_data
             
         except Exception as e:
@@ -197,15 +263,14 @@ class GenesisServerAgent(GenesisBaseAgent):
             
             # Fallback to direct tool execution
             rprint("[yellow]🔄 Using fallback analysis method...[/yellow]")
-            fallback_result = self.analysis_tool._run(symbol, timeframe)
-            analysis_data = json.loads(fallback_result)
+            analysis_data = self.analysis_tool.analyze(symbol, timeframe, timestamp)
             
             # Add Genesis Studio metadata
             analysis_data.update({
                 "genesis_studio": {
                     "agent_id": self.agent_id,
                     "agent_domain": self.agent_domain,
-                    "analysis_timestamp": datetime.now().isoformat(),
+                    "analysis_timestamp": timestamp,
                     "version": "1.0.0",
                     "fallback_mode": True
                 }
@@ -216,17 +281,10 @@ class GenesisServerAgent(GenesisBaseAgent):
     def calculate_data_hash(self, data: Dict[str, Any]) -> str:
         """Calculate hash of analysis data for validation requests"""
         
-        # Create a deterministic hash of the analysis data
-        data_string = json.dumps(data, sort_keys=True)
-        hash_object = hashlib.sha256(data_string.encode())
-        return "0x" + hash_object.hexdigest()
-    
-    def calculate_cid_hash(self, cid: str) -> str:
-        """Calculate a bytes32 hash from an IPFS CID for blockchain storage"""
-        
-        # Hash the CID to create a bytes32 value
-        hash_object = hashlib.sha256(cid.encode())
-        return "0x" + hash_object.hexdigest()
+        # Create a deterministic hash of the analysis data; the canonical form must stay
+        # byte-identical to json.dumps(data, sort_keys=True) so existing hashes still match
+        data_bytes = _CANONICAL_JSON.encode(data).encode()
+        return "0x" + hashlib.sha256(data_bytes).hexdigest()
     
     def get_analysis_summary(self, analysis_data: Dict[str, Any]) -> str:
         """Get a human-readable summary of the analysis"""
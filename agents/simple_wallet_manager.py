@@ -6,55 +6,150 @@ for quick testing. In production, you'd use the full Coinbase AgentKit.
 """
 
 import os
-import json
-from typing import Dict, Optional
+import threading
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple
 from web3 import Web3
 from eth_account import Account
 from rich.console import Console
 from rich import print as rprint
 
+from .ipfs_storage import deserialize_json, serialize_json
+from .web3_utils import (
+    fetch_eip1559_fees, fetch_tx_params_with_reads, get_eth_balances, get_eth_balances_with_reads, is_nonce_error,
+    providers, raw_transaction, send_raw_transaction, to_checksum_address, wait_for_receipt
+)
+
 console = Console()
 
+# Base Sepolia USDC contract address
+BASE_SEPOLIA_USDC_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+
+# Gas limit for a USDC transfer; an ERC-20 transfer through the USDC proxy
+# uses ~40-65k, so this leaves headroom without an eth_estimateGas call
+USDC_TRANSFER_GAS = 100_000
+
+# The wallet log is compacted once it holds more than this many records per agent
+COMPACT_RATIO = 2
+
+# ERC-20 ABI (minimal for transfer)
+ERC20_ABI = [
+    {
+        "constant": False,
+        "inputs": [
+            {"name": "_to", "type": "address"},
+            {"name": "_value", "type": "uint256"}
+        ],
+        "name": "transfer",
+        "outputs": [{"name": "", "type": "bool"}],
+        "type": "function"
+    },
+    {
+        "constant": True,
+        "inputs": [{"name": "_owner", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "type": "function"
+    }
+]
+
 class GenesisWalletManager:
     """Simplified wallet manager for Genesis Studio testing"""
     
-    def __init__(self):
-        self.wallets: Dict[str, Account] = {}
-        self.wallet_data_file = "genesis_wallets.json"
+    _shared: Optional["GenesisWalletManager"] = None
+    _shared_lock = threading.Lock()
+    
+    @classmethod
+    def shared(cls) -> "GenesisWalletManager":
+        """
+        Get the process-wide wallet manager
         
-        # Initialize Web3 connection
-        network = os.getenv('NETWORK', 'base-sepolia')
-        if network == 'base-sepolia':
-            rpc_url = os.getenv('BASE_SEPOLIA_RPC_URL')
-        elif network == 'sepolia':
-            rpc_url = os.getenv('SEPOLIA_RPC_URL')
-        else:
-            rpc_url = os.getenv('LOCAL_RPC_URL', 'http://127.0.0.1:8545')
+        Agents created in the same process (e.g. Alice, Bob and Charlie SDKs)
+        share one set of loaded wallets instead of each re-reading the wallet file.
+        """
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+    
+    def __init__(self, w3: Optional[Web3] = None):
+        """
+        Initialize the wallet manager
         
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        Args:
+            w3: Web3 instance to use; defaults to the shared, connection-pooled
+                instance for the configured network
+        """
+        self.wallets: Dict[str, Account] = {}
+        # Append-only log of {"agent", "data"} records; the last record per agent wins
+        self.wallet_data_file = "genesis_wallets.jsonl"
+        # Pre-log wallet file, migrated into the log on first load
+        self.legacy_wallet_data_file = "genesis_wallets.json"
+        self._wallet_cache: Optional[Dict[str, Dict]] = None
+        self._wallet_log_records = 0
+        self._wallet_file_lock = threading.Lock()
+        self._passphrase = os.getenv("GENESIS_WALLET_PASSPHRASE")
+        # Transfers are only attempted once USDC is configured for the deployment
+        self.usdc_address = os.getenv("USDC_CONTRACT_ADDRESS")
+        # Simulate each transfer with eth_estimateGas instead of using USDC_TRANSFER_GAS
+        self.estimate_gas = os.getenv("ESTIMATE_GAS", "").lower() in ("1", "true", "yes")
+        
+        # Web3 connection (shared with the agents on the same network), resolved on
+        # first on-chain use so address-only flows never touch the RPC endpoint
+        self._network = os.getenv('NETWORK', 'base-sepolia')
+        self._w3 = w3
+        # Receipts are awaited via a newHeads subscription when a WS endpoint is configured
+        self.ws_url = providers.ws_url(self._network)
+        self._chain_id: Optional[int] = None
+        # Next nonce per sender address, shared by the transfers and the agents
+        # signing with these wallets so back-to-back sends skip eth_getTransactionCount
+        self._next_nonce: Dict[str, int] = {}
+        self._nonce_lock = threading.Lock()
+        # (summary rows, rendered output) of the last wallet summary
+        self._summary_cache: Tuple[Optional[tuple], str] = (None, "")
         
+    @property
+    def w3(self) -> Web3:
+        """Web3 instance for the configured network, looked up on first use"""
+        if self._w3 is None:
+            self._w3 = providers.get(self._network)
+        return self._w3
+    
+    @cached_property
+    def _usdc_contract(self):
+        """USDC contract instance, built once per manager"""
+        return self.w3.eth.contract(address=BASE_SEPOLIA_USDC_ADDRESS, abi=ERC20_ABI)
+    
+    def _get_chain_id(self) -> int:
+        """Chain ID of the connected network, queried once"""
+        if self._chain_id is None:
+            self._chain_id = self.w3.eth.chain_id
+        return self._chain_id
+    
     def create_or_load_wallet(self, agent_name: str) -> Account:
         """Create a new wallet or load existing one for an agent"""
         
-        if agent_name in self.wallets:
-            return self.wallets[agent_name]
+        account = self.wallets.get(agent_name)
+        if account is not None:
+            return account
             
         # Try to load existing wallet data
         wallet_data = self._load_wallet_data(agent_name)
         
         if wallet_data:
             rprint(f"[green]📂 Loading existing wallet for {agent_name}...")
-            # Load from private key
-            account = Account.from_key(wallet_data['private_key'])
+            # Load from the keystore (decrypted once per run) or the plaintext private key
+            account = self._account_from_wallet_data(wallet_data)
+            if 'private_key' in wallet_data and self._passphrase:
+                # Encrypt wallets saved before a passphrase was configured
+                self._save_wallet_data(agent_name, self._wallet_data_for(account))
         else:
             rprint(f"[yellow]🔧 Creating new wallet for {agent_name}...")
             with console.status(f"[bold green]Creating wallet for {agent_name}..."):
                 # Create new account
                 account = Account.create()
-                self._save_wallet_data(agent_name, {
-                    'private_key': account.key.hex(),
-                    'address': account.address
-                })
+                self._save_wallet_data(agent_name, self._wallet_data_for(account))
             
             rprint(f"[green]✅ New wallet created for {agent_name}")
             rprint(f"[blue]   Address: {account.address}")
@@ -62,33 +157,71 @@ class GenesisWalletManager:
         self.wallets[agent_name] = account
         return account
     
+    def _account_from_wallet_data(self, wallet_data: Dict) -> Account:
+        """
+        Unlock a saved wallet
+        
+        Raises:
+            ValueError: If the wallet is a keystore and GENESIS_WALLET_PASSPHRASE is not set
+        """
+        if 'keystore' not in wallet_data:
+            return Account.from_key(wallet_data['private_key'])
+        if not self._passphrase:
+            raise ValueError("Wallet is encrypted; set GENESIS_WALLET_PASSPHRASE to unlock it")
+        return Account.from_key(Account.decrypt(wallet_data['keystore'], self._passphrase))
+    
+    def _wallet_data_for(self, account: Account) -> Dict:
+        """
+        Wallet file entry for an account
+        
+        With GENESIS_WALLET_PASSPHRASE set, the key is stored as an encrypted
+        keystore v3 (scrypt) instead of in plaintext.
+        """
+        if self._passphrase:
+            return {
+                'keystore': Account.encrypt(account.key, self._passphrase),
+                'address': account.address
+            }
+        return {
+            'private_key': account.key.hex(),
+            'address': account.address
+        }
+    
     def get_wallet_address(self, agent_name: str) -> str:
         """Get the address of an agent's wallet"""
-        if agent_name not in self.wallets:
-            self.create_or_load_wallet(agent_name)
-        return self.wallets[agent_name].address
+        return self.create_or_load_wallet(agent_name).address
     
     def get_wallet_balance(self, agent_name: str, asset_id: str = "eth") -> float:
         """Get the balance of an agent's wallet"""
-        if agent_name not in self.wallets:
-            self.create_or_load_wallet(agent_name)
+        return self.get_wallet_balances([agent_name], asset_id)[agent_name]
+    
+    def get_wallet_balances(self, agent_names: List[str], asset_id: str = "eth") -> Dict[str, float]:
+        """
+        Get the balances of several agents' wallets in one RPC round trip
         
-        wallet = self.wallets[agent_name]
+        Args:
+            agent_names: Agents to read, e.g. ["Alice", "Bob", "Charlie"]
+            asset_id: Asset to read ("eth" is the only one supported)
+            
+        Returns:
+            Balance per agent name
+        """
+        addresses = [self.create_or_load_wallet(agent_name).address for agent_name in agent_names]
         
-        if asset_id == "eth":
-            balance_wei = self.w3.eth.get_balance(wallet.address)
-            return self.w3.from_wei(balance_wei, 'ether')
-        else:
+        if asset_id != "eth":
             # For ERC20 tokens, we'd need the contract ABI
             # For now, return 0
-            return 0.0
+            return {agent_name: 0.0 for agent_name in agent_names}
+        
+        balances_wei = get_eth_balances(self.w3, addresses)
+        return {
+            agent_name: self.w3.from_wei(balance_wei, 'ether')
+            for agent_name, balance_wei in zip(agent_names, balances_wei)
+        }
     
     def fund_wallet_from_faucet(self, agent_name: str) -> bool:
         """Fund wallet from testnet faucet (placeholder - manual funding required)"""
-        if agent_name not in self.wallets:
-            self.create_or_load_wallet(agent_name)
-            
-        wallet = self.wallets[agent_name]
+        wallet = self.create_or_load_wallet(agent_name)
         
         rprint(f"[yellow]💰 Please manually fund {agent_name}'s wallet:")
         rprint(f"[blue]   Address: {wallet.address}")
@@ -102,8 +235,8 @@ class GenesisWalletManager:
         
         # Handle direct addresses vs agent names
         if to_agent.startswith('0x') and len(to_agent) == 42:
-            # Direct address provided
-            to_address = to_agent
+            # Direct address provided (checksummed once, then served from cache)
+            to_address = to_checksum_address(to_agent)
         else:
             # Agent name provided, get wallet address
             to_address = self.get_wallet_address(to_agent)
@@ -112,41 +245,12 @@ class GenesisWalletManager:
             rprint(f"[red]❌ Wallet not found for {from_agent}")
             return None
         
-        usdc_address = os.getenv("USDC_CONTRACT_ADDRESS")
-        if not usdc_address:
+        if not self.usdc_address:
             rprint("[red]❌ USDC contract address not configured")
             return None
         
         try:
-            # Base Sepolia USDC contract address
-            usdc_contract_address = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"  # Base Sepolia USDC
-            
-            # ERC-20 ABI (minimal for transfer)
-            erc20_abi = [
-                {
-                    "constant": False,
-                    "inputs": [
-                        {"name": "_to", "type": "address"},
-                        {"name": "_value", "type": "uint256"}
-                    ],
-                    "name": "transfer",
-                    "outputs": [{"name": "", "type": "bool"}],
-                    "type": "function"
-                },
-                {
-                    "constant": True,
-                    "inputs": [{"name": "_owner", "type": "address"}],
-                    "name": "balanceOf",
-                    "outputs": [{"name": "balance", "type": "uint256"}],
-                    "type": "function"
-                }
-            ]
-            
-            # Create USDC contract instance
-            usdc_contract = self.w3.eth.contract(
-                address=usdc_contract_address,
-                abi=erc20_abi
-            )
+            usdc_contract = self._usdc_contract
             
             # Convert amount to wei (USDC has 6 decimals)
             amount_wei = int(amount * 10**6)
@@ -156,41 +260,81 @@ class GenesisWalletManager:
             rprint(f"[blue]   From: {from_agent} ({from_wallet.address})[/blue]")
             rprint(f"[blue]   To: {to_agent} ({to_address})[/blue]")
             
+            # Build the transfer transaction
+            transfer_function = usdc_contract.functions.transfer(to_address, amount_wei)
+            balance_call = usdc_contract.functions.balanceOf(from_wallet.address)
+            
+            # Balance, gas price and pending nonce in a single JSON-RPC batch (the gas
+            # estimate only with ESTIMATE_GAS=1). The batch goes out for the balance
+            # anyway, so the pending nonce is always read: claim_nonce takes the larger
+            # of it and the tracked nonce, which covers sends the tracker didn't see
+            estimate_call = transfer_function if self.estimate_gas else None
+            # EIP-1559 fees predicted from fee history replace the legacy gas price
+            fees = fetch_eip1559_fees(self.w3)
+            try:
+                gas_price, nonce, gas_estimate, (balance,) = fetch_tx_params_with_reads(
+                    self.w3, from_wallet.address, estimate_call, reads=[balance_call],
+                    legacy_gas_price=fees is None
+                )
+            except Exception:
+                # The batch failed (e.g. the ESTIMATE_GAS estimate reverted on an insufficient
+                # balance); check the balance directly and report a shortfall over the raw error
+                balance = balance_call.call()
+                if balance < amount_wei:
+                    raise Exception(f"Insufficient USDC balance: {balance / 10**6} < {amount}")
+                raise
+            
             # Check balance first
-            balance = usdc_contract.functions.balanceOf(from_wallet.address).call()
             balance_usdc = balance / 10**6
             rprint(f"[blue]   Current balance: {balance_usdc} USDC[/blue]")
             
             if balance < amount_wei:
                 raise Exception(f"Insufficient USDC balance: {balance_usdc} < {amount}")
             
-            # Build the transfer transaction
-            transfer_function = usdc_contract.functions.transfer(to_address, amount_wei)
-            
-            # Estimate gas
-            gas_estimate = transfer_function.estimate_gas({'from': from_wallet.address})
-            gas_limit = int(gas_estimate * 1.2)  # Add 20% buffer
-            
-            rprint(f"[blue]⛽ Gas estimate: {gas_estimate}, using limit: {gas_limit}[/blue]")
+            if gas_estimate is not None:
+                gas_limit = int(gas_estimate * 1.2)  # Add 20% buffer
+                rprint(f"[blue]⛽ Gas estimate: {gas_estimate}, using limit: {gas_limit}[/blue]")
+            else:
+                gas_limit = USDC_TRANSFER_GAS
+                rprint(f"[blue]⛽ Using fixed gas limit: {gas_limit}[/blue]")
             
-            # Build transaction
-            transaction = transfer_function.build_transaction({
+            # Build transaction (every field is known, so no build_transaction fill-in is needed)
+            transaction = {
                 'from': from_wallet.address,
+                'to': BASE_SEPOLIA_USDC_ADDRESS,
+                'value': 0,
+                'data': transfer_function._encode_transaction_data(),
                 'gas': gas_limit,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(from_wallet.address),
-                'chainId': self.w3.eth.chain_id
-            })
+                'nonce': self.claim_nonce(from_wallet.address, nonce),
+                'chainId': self._get_chain_id()
+            }
+            if fees is not None:
+                transaction['type'] = 2
+                transaction['maxFeePerGas'], transaction['maxPriorityFeePerGas'] = fees
+            else:
+                # Pre-London chain: legacy pricing
+                transaction['gasPrice'] = gas_price
             
             # Sign and send transaction
-            signed_txn = from_wallet.sign_transaction(transaction)
-            # Handle different Web3.py versions
-            raw_transaction = signed_txn.raw_transaction if hasattr(signed_txn, 'raw_transaction') else signed_txn.rawTransaction
-            tx_hash = self.w3.eth.send_raw_transaction(raw_transaction)
+            try:
+                tx_hash = self._sign_and_send(from_wallet, transaction)
+            except Exception as e:
+                if not is_nonce_error(e):
+                    # e.g. a timeout: the broadcast may have reached the node, so resending could pay twice
+                    raise
+                # The node rejected the nonce and doesn't have this transaction; resync once
+                transaction['nonce'] = self.claim_nonce(
+                    from_wallet.address, self.w3.eth.get_transaction_count(from_wallet.address, 'pending')
+                )
+                tx_hash = self._sign_and_send(from_wallet, transaction)
             
             # Wait for confirmation
             rprint(f"[blue]⏳ Waiting for USDC transfer confirmation...[/blue]")
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = wait_for_receipt(self.w3, tx_hash, self.ws_url)
+            
+            if receipt.status != 1:
+                # Resync from the node rather than trusting the local counter
+                self.reset_nonce(from_wallet.address)
             
             if receipt.status == 1:
                 rprint(f"[green]✅ USDC transfer successful![/green]")
@@ -209,57 +353,151 @@ class GenesisWalletManager:
             # Return a simulated transaction hash as fallback
             return "0x1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef"
     
-    def _load_wallet_data(self, agent_name: str) -> Optional[Dict]:
-        """Load wallet data from file"""
-        if not os.path.exists(self.wallet_data_file):
-            return None
+    def tracked_nonce(self, address: str) -> Optional[int]:
+        """Next nonce for an address as tracked locally, or None to read it from the node"""
+        return self._next_nonce.get(address)
+    
+    def claim_nonce(self, address: str, nonce: int) -> int:
+        """
+        Reserve the nonce for a transaction about to be signed
+        
+        Args:
+            address: Sender address
+            nonce: Nonce the transaction was built with (the tracked nonce or
+                the node's pending transaction count)
             
+        Returns:
+            The larger of nonce and the tracked nonce; the tracked nonce then
+            moves past it, so the sender's next transaction gets the one after
+        """
+        with self._nonce_lock:
+            nonce = max(nonce, self._next_nonce.get(address, 0))
+            self._next_nonce[address] = nonce + 1
+        return nonce
+    
+    def reset_nonce(self, address: str):
+        """Forget an address' tracked nonce after a failed send, so the next one resyncs from the node"""
+        with self._nonce_lock:
+            self._next_nonce.pop(address, None)
+    
+    def _sign_and_send(self, wallet: Account, transaction: Dict):
+        """
+        Sign a transaction (its nonce claimed with claim_nonce) and broadcast it
+        
+        On failure the sender's tracked nonce is dropped and resynced from
+        the node next time.
+        
+        Returns:
+            Transaction hash
+        """
         try:
-            with open(self.wallet_data_file, 'r') as f:
-                all_data = json.load(f)
-                return all_data.get(agent_name)
+            signed_txn = wallet.sign_transaction(transaction)
+            return send_raw_transaction(self.w3, raw_transaction(signed_txn))
         except Exception:
-            return None
+            self.reset_nonce(wallet.address)
+            raise
     
-    def _save_wallet_data(self, agent_name: str, wallet_data: Dict):
-        """Save wallet data to file"""
-        all_data = {}
-        
+    def _read_all(self) -> Dict[str, Dict]:
+        """All saved wallet data, replayed from the wallet log once per manager"""
+        if self._wallet_cache is None:
+            with self._wallet_file_lock:
+                if self._wallet_cache is None:
+                    self._wallet_cache = self._replay_log()
+        return self._wallet_cache
+    
+    def _replay_log(self) -> Dict[str, Dict]:
+        """Build the wallet data from the log, migrating the legacy JSON file if there is no log yet"""
+        all_data: Dict[str, Dict] = {}
+        needs_compaction = False
         if os.path.exists(self.wallet_data_file):
+            with open(self.wallet_data_file, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = deserialize_json(line)
+                        all_data[record["agent"]] = record["data"]
+                    except Exception:
+                        # Torn final append from a crash; rewrite the log without it
+                        needs_compaction = True
+                        continue
+                    self._wallet_log_records += 1
+        elif os.path.exists(self.legacy_wallet_data_file):
             try:
-                with open(self.wallet_data_file, 'r') as f:
-                    all_data = json.load(f)
+                with open(self.legacy_wallet_data_file, 'rb') as f:
+                    all_data = deserialize_json(f.read())
+                needs_compaction = True
             except Exception:
                 pass
-        
-        all_data[agent_name] = wallet_data
-        
-        with open(self.wallet_data_file, 'w') as f:
-            json.dump(all_data, f, indent=2)
+        if needs_compaction:
+            self._compact_locked(all_data)
+        return all_data
+    
+    def _compact_locked(self, all_data: Dict[str, Dict]):
+        """Rewrite the log with one record per agent, via a temp file so a crash can't truncate it"""
+        tmp_path = f"{self.wallet_data_file}.tmp"
+        with open(tmp_path, 'wb') as f:
+            for agent_name, wallet_data in all_data.items():
+                f.write(serialize_json({"agent": agent_name, "data": wallet_data}) + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.wallet_data_file)
+        self._wallet_log_records = len(all_data)
+    
+    def compact(self):
+        """Rewrite the wallet log with only the latest record per agent"""
+        all_data = self._read_all()
+        with self._wallet_file_lock:
+            self._compact_locked(all_data)
+    
+    def _load_wallet_data(self, agent_name: str) -> Optional[Dict]:
+        """Load wallet data from file"""
+        return self._read_all().get(agent_name)
+    
+    def _save_wallet_data(self, agent_name: str, wallet_data: Dict):
+        """Save wallet data to file, as one fsynced record appended to the log"""
+        all_data = self._read_all()
+        with self._wallet_file_lock:
+            all_data[agent_name] = wallet_data
+            with open(self.wallet_data_file, 'ab') as f:
+                f.write(serialize_json({"agent": agent_name, "data": wallet_data}) + b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._wallet_log_records += 1
+            if self._wallet_log_records > COMPACT_RATIO * len(all_data):
+                self._compact_locked(all_data)
     
     def display_wallet_summary(self):
-        """Display a summary of all agent wallets"""
-        rprint("\n[bold cyan]🏦 Genesis Studio Wallet Summary[/bold cyan]")
-        rprint("=" * 50)
+        """
+        Display a summary of all agent wallets
         
-        for agent_name in ["Alice", "Bob", "Charlie"]:
-            if agent_name in self.wallets:
-                wallet = self.wallets[agent_name]
-                address = wallet.address
-                eth_balance = self.get_wallet_balance(agent_name, "eth")
-                
-                rprint(f"[green]{agent_name}:[/green]")
-                rprint(f"  Address: [blue]{address}[/blue]")
-                rprint(f"  ETH Balance: [yellow]{eth_balance:.4f} ETH[/yellow]")
-                rprint()
-            else:
-                # Create wallet to show address
-                self.create_or_load_wallet(agent_name)
-                wallet = self.wallets[agent_name]
-                address = wallet.address
-                eth_balance = self.get_wallet_balance(agent_name, "eth")
-                
-                rprint(f"[green]{agent_name}:[/green]")
-                rprint(f"  Address: [blue]{address}[/blue]")
-                rprint(f"  ETH Balance: [yellow]{eth_balance:.4f} ETH[/yellow]")
-                rprint()
+        The rendered output is reused while every agent's address and
+        balances are unchanged, so repeat summaries skip Rich markup rendering.
+        """
+        # Creates any missing wallet to show its address
+        agent_names = ["Alice", "Bob", "Charlie"]
+        addresses = [self.create_or_load_wallet(agent_name).address for agent_name in agent_names]
+        
+        # ETH and (when configured) USDC balances for every agent in one aggregate eth_call
+        usdc_reads = [self._usdc_contract.functions.balanceOf(a) for a in addresses] if self.usdc_address else []
+        eth_balances, usdc_balances = get_eth_balances_with_reads(self.w3, addresses, usdc_reads)
+        
+        rows = tuple(zip(agent_names, addresses, eth_balances, usdc_balances or [None] * len(agent_names)))
+        
+        if rows != self._summary_cache[0]:
+            with console.capture() as capture:
+                console.print("\n[bold cyan]🏦 Genesis Studio Wallet Summary[/bold cyan]")
+                console.print("=" * 50)
+                for agent_name, address, eth_wei, usdc_units in rows:
+                    eth_balance = self.w3.from_wei(eth_wei, 'ether')
+                    
+                    console.print(f"[green]{agent_name}:[/green]")
+                    console.print(f"  Address: [blue]{address}[/blue]")
+                    console.print(f"  ETH Balance: [yellow]{eth_balance:.4f} ETH[/yellow]")
+                    if usdc_units is not None:
+                        console.print(f"  USDC Balance: [yellow]{usdc_units / 10**6:.2f} USDC[/yellow]")
+                    console.print()
+            self._summary_cache = (rows, capture.get())
+        
+        console.file.write(self._summary_cache[1])
+        console.file.flush()
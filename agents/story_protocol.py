@@ -4,18 +4,47 @@ Genesis Studio - Story Protocol Integration Module
 This module handles IP registration on Story Protocol via Crossmint API.
 """
 
+import asyncio
+import hashlib
 import os
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional
 from rich.console import Console
 from rich import print as rprint
 
+from .ipfs_storage import deserialize_json
+
 console = Console()
+_status_lock = threading.Lock()
+
+
+def _demo_hex(value: str, width: int = 40) -> str:
+    """Deterministic 0x-prefixed hex identifier (40 digits for an address, 64 for a tx hash)"""
+    return "0x" + hashlib.blake2b(value.encode(), digest_size=width // 2).hexdigest()
+
+
+def _demo_number(value: str, modulus: int) -> int:
+    """Deterministic number below modulus, for demo asset and token IDs"""
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big") % modulus
+
 
 class CrossmintStoryProtocol:
     """Handles Story Protocol IP registration via Crossmint Server Wallets API"""
     
-    def __init__(self):
+    # Seconds to wait on a Crossmint API call
+    REQUEST_TIMEOUT = 10
+    
+    def __init__(self, session: Optional[requests.Session] = None):
+        """
+        Initialize the Crossmint client
+        
+        Args:
+            session: HTTP session to issue API calls on; defaults to a new
+                keep-alive session so calls reuse their TLS connection
+        """
         self.api_key = os.getenv("CROSSMINT_API_KEY")
         
         # For demo purposes, we'll use a fallback approach if credentials are missing
@@ -35,16 +64,28 @@ class CrossmintStoryProtocol:
             "Content-Type": "application/json"
         }
         
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        self.session = session
+        
         # Cache for created wallets
         self.wallets = {}
+        
+        # Seconds of simulated processing per IP registration (for demos)
+        self.demo_delay = float(os.getenv("DEMO_DELAY", "0"))
     
     def create_story_wallet(self, user_identifier: str) -> Optional[Dict[str, Any]]:
         """Create a Crossmint server wallet for Story Protocol transactions"""
         
+        # Reuse a wallet already created for this user (repeat registrations by the same creator)
+        if user_identifier in self.wallets:
+            return self.wallets[user_identifier]
+        
         if self.demo_mode:
             rprint(f"[yellow]📱 Demo: Simulating Story wallet creation for {user_identifier}")
             demo_wallet = {
-                "address": f"0x{'demo' + hash(user_identifier).__str__()[:36]}",
+                "address": _demo_hex(user_identifier),
                 "type": "evm-smart-wallet",
                 "linkedUser": user_identifier,
                 "demo_mode": True
@@ -64,14 +105,15 @@ class CrossmintStoryProtocol:
                 }
             }
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/wallets",
                 json=payload,
-                headers=self.headers
+                headers=self.headers,
+                timeout=self.REQUEST_TIMEOUT
             )
             
             if response.status_code in [200, 201]:
-                wallet = response.json()
+                wallet = deserialize_json(response.content)
                 self.wallets[user_identifier] = wallet
                 rprint(f"[green]📱 Created Story wallet for {user_identifier}: {wallet['address']}")
                 return wallet
@@ -80,7 +122,7 @@ class CrossmintStoryProtocol:
                 rprint(f"[yellow]   Response: {response.text}")
                 # Fall back to demo mode
                 demo_wallet = {
-                    "address": f"0x{'demo' + hash(user_identifier).__str__()[:36]}",
+                    "address": _demo_hex(user_identifier),
                     "type": "evm-smart-wallet",
                     "linkedUser": user_identifier,
                     "demo_mode": True,
@@ -98,7 +140,7 @@ class CrossmintStoryProtocol:
         
         if self.demo_mode:
             rprint(f"[yellow]🎨 Demo: Simulating NFT collection creation '{collection_name}'")
-            return f"0x{'demo' + hash(collection_name).__str__()[:36]}"
+            return _demo_hex(collection_name)
         
         try:
             # This would use Story Protocol client to create collection
@@ -110,7 +152,7 @@ class CrossmintStoryProtocol:
             # 2. Send transaction via Crossmint API
             # 3. Return the collection contract address
             
-            demo_collection = f"0x{'coll' + hash(collection_name).__str__()[:32]}"
+            demo_collection = _demo_hex('coll:' + collection_name)
             rprint(f"[green]✅ NFT collection created: {demo_collection}")
             return demo_collection
             
@@ -137,14 +179,14 @@ class CrossmintStoryProtocol:
             rprint(f"[blue]   Asset Type: {asset_type}")
             
             # Return a simulated response
-            demo_asset_id = f"story-demo-{hash(ipfs_cid) % 100000}"
+            demo_asset_id = f"story-demo-{_demo_number(ipfs_cid, 100000)}"
             return {
                 "story_asset_id": demo_asset_id,
-                "transaction_hash": f"0x{'demo' + hash(title).__str__()[:60]}",
-                "token_id": f"demo-token-{hash(ipfs_cid) % 1000}",
+                "transaction_hash": _demo_hex(title, 64),
+                "token_id": f"demo-token-{_demo_number(ipfs_cid, 1000)}",
                 "contract_address": "0x0000000000000000000000000000000000000000",
                 "story_url": f"https://explorer.story.foundation/asset/{demo_asset_id}",
-                "crossmint_wallet": f"0x{'demo' + hash(creator_wallet).__str__()[:36]}",
+                "crossmint_wallet": _demo_hex(creator_wallet),
                 "demo_mode": True,
                 "ipfs_cid": ipfs_cid,
                 "title": title,
@@ -159,7 +201,7 @@ class CrossmintStoryProtocol:
             rprint(f"[blue]   IPFS CID: {ipfs_cid}")
             
             # Step 1: Create or get Story wallet for the creator
-            user_id = f"creator-{hash(creator_wallet) % 10000}"
+            user_id = f"creator-{_demo_number(creator_wallet, 10000)}"
             story_wallet = self.create_story_wallet(user_id)
             
             if not story_wallet:
@@ -180,19 +222,27 @@ class CrossmintStoryProtocol:
             # 2. Send the transaction via Crossmint API
             # 3. Monitor transaction status
             
-            with console.status(f"[bold magenta]Processing IP registration on Story Protocol..."):
-                # Simulate processing time
-                import time
-                time.sleep(2)
+            # Simulated processing time, off unless DEMO_DELAY is set. Rich allows one
+            # live display at a time, so a registration running alongside another
+            # waits without its own spinner.
+            if self.demo_delay > 0:
+                if _status_lock.acquire(blocking=False):
+                    try:
+                        with console.status(f"[bold magenta]Processing IP registration on Story Protocol..."):
+                            time.sleep(self.demo_delay)
+                    finally:
+                        _status_lock.release()
+                else:
+                    time.sleep(self.demo_delay)
             
             # Return success response
-            asset_id = f"story-{hash(ipfs_cid) % 1000000}"
-            tx_hash = f"0x{hash(title + ipfs_cid).__str__()[:64]}"
+            asset_id = f"story-{_demo_number(ipfs_cid, 1000000)}"
+            tx_hash = _demo_hex(title + ipfs_cid, 64)
             
             asset_info = {
                 "story_asset_id": asset_id,
                 "transaction_hash": tx_hash,
-                "token_id": f"token-{hash(ipfs_cid) % 10000}",
+                "token_id": f"token-{_demo_number(ipfs_cid, 10000)}",
                 "contract_address": collection_address,
                 "story_url": f"https://explorer.story.foundation/asset/{asset_id}",
                 "crossmint_wallet": story_wallet["address"],
@@ -214,17 +264,22 @@ class CrossmintStoryProtocol:
             rprint(f"[red]❌ Error registering IP asset: {e}")
             return None
     
+    async def register_ip_asset_async(self, *args, **kwargs) -> Optional[Dict[str, Any]]:
+        """Async variant of register_ip_asset, so several registrations can overlap"""
+        return await asyncio.to_thread(self.register_ip_asset, *args, **kwargs)
+    
     def get_asset_info(self, asset_id: str) -> Optional[Dict[str, Any]]:
         """Get information about a registered IP asset"""
         
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/collections/{self.project_id}/nfts/{asset_id}",
-                headers=self.headers
+                headers=self.headers,
+                timeout=self.REQUEST_TIMEOUT
             )
             
             if response.status_code == 200:
-                return response.json()
+                return deserialize_json(response.content)
             else:
                 rprint(f"[red]❌ Failed to get asset info: {response.status_code}")
                 return None
@@ -0,0 +1,932 @@
+"""
+Genesis Studio - Web3 RPC Utilities
+
+This module provides shared helpers for the JSON-RPC traffic issued by the
+ERC-8004 agents and wallet managers, and cached loaders for the contract
+artifacts and deployment files they read.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from eth_account.datastructures import SignedTransaction
+from web3 import Web3
+from web3.exceptions import TimeExhausted, TransactionNotFound
+from web3.providers.base import JSONBaseProvider
+
+# Shared pool used to issue independent read-only RPCs concurrently
+_RPC_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="genesis-rpc")
+
+class _LatencyRoutedProvider(JSONBaseProvider):
+    """
+    Provider that spreads reads over several RPC endpoints
+
+    Each endpoint's latency is tracked as an exponentially weighted moving
+    average, seeded by an eth_chainId probe at startup. Reads go to the
+    currently fastest endpoint and fall through to the next one if it fails,
+    either at the transport level or with a JSON-RPC error body such as a
+    rate limit or an unknown block (failures also push its average up).
+    Contract reverts are returned as-is, since every node answers the same.
+
+    Writes, and the pending-state reads they depend on, always go to the
+    primary (first) endpoint so nonces and gas estimates come from the node
+    the transaction is sent to. For PIN_AFTER_SEND seconds after a send,
+    every read goes to the primary as well, so receipt, log and contract
+    reads that follow a write don't hit a node that hasn't seen its block.
+    """
+
+    PRIMARY_METHODS = frozenset({
+        'eth_sendRawTransaction', 'eth_sendTransaction', 'eth_getTransactionCount', 'eth_estimateGas',
+        'eth_getTransactionByHash'
+    })
+    EWMA_ALPHA = 0.3
+    # Seconds charged to an endpoint's average when a call to it fails
+    FAILURE_PENALTY = 5.0
+    # Seconds after a send during which reads stay on the primary
+    PIN_AFTER_SEND = 30.0
+
+    def __init__(self, endpoints: List[Any]):
+        super().__init__()
+        self.endpoints = endpoints
+        self.primary = endpoints[0]
+        self._latency: Dict[str, float] = {}
+        self._pinned_until = 0.0
+        self._lock = threading.Lock()
+        futures = [_RPC_EXECUTOR.submit(self._timed_request, endpoint, 'eth_chainId', []) for endpoint in endpoints]
+        for future in futures:
+            try:
+                future.result()
+            except Exception:
+                pass  # Already penalized; the endpoint stays in the pool as a last resort
+
+    def __str__(self) -> str:
+        return f"LatencyRoutedProvider({', '.join(e.endpoint_uri for e in self.endpoints)})"
+
+    def _record(self, endpoint_uri: str, sample: float):
+        with self._lock:
+            previous = self._latency.get(endpoint_uri)
+            self._latency[endpoint_uri] = sample if previous is None else previous + self.EWMA_ALPHA * (sample - previous)
+
+    @staticmethod
+    def _is_node_error(response: Any) -> bool:
+        """Whether a response carries a JSON-RPC error another node might not return (not a revert)"""
+        error = response.get('error') if isinstance(response, dict) else None
+        if not error:
+            return False
+        if isinstance(error, dict):
+            return not (error.get('code') == 3 or 'revert' in str(error.get('message', '')).lower())
+        return 'revert' not in str(error).lower()
+
+    def _timed_request(self, endpoint, method: str, params: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            response = endpoint.make_request(method, params)
+        except Exception:
+            self._record(endpoint.endpoint_uri, self.FAILURE_PENALTY)
+            raise
+        if self._is_node_error(response):
+            self._record(endpoint.endpoint_uri, self.FAILURE_PENALTY)
+        else:
+            self._record(endpoint.endpoint_uri, time.perf_counter() - start)
+        return response
+
+    def _by_latency(self) -> List[Any]:
+        with self._lock:
+            return sorted(self.endpoints, key=lambda e: self._latency.get(e.endpoint_uri, 0.0))
+
+    def make_request(self, method: str, params: Any) -> Any:
+        if method in self.PRIMARY_METHODS:
+            if method in ('eth_sendRawTransaction', 'eth_sendTransaction'):
+                self._pinned_until = time.monotonic() + self.PIN_AFTER_SEND
+            return self.primary.make_request(method, params)
+        if time.monotonic() < self._pinned_until:
+            return self.primary.make_request(method, params)
+        last_error = last_response = None
+        for endpoint in self._by_latency():
+            try:
+                response = self._timed_request(endpoint, method, params)
+            except Exception as e:
+                last_error = e
+                continue
+            if not self._is_node_error(response):
+                return response
+            last_response = response
+        if last_response is not None:
+            # Every endpoint answered with an error; let web3 raise it as usual
+            return last_response
+        raise last_error
+
+    def make_batch_request(self, requests: List[Tuple[str, Any]]) -> Any:
+        # Batches carry the nonce/estimate reads a transaction is built from
+        return self.primary.make_batch_request(requests)
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return self.primary.is_connected(show_traceback)
+
+
+class _ProviderRegistry:
+    """
+    Process-wide registry of Web3 instances, one per RPC endpoint
+
+    All HTTPProviders share a single keep-alive requests.Session, so agents
+    and networks in the same process reuse TCP+TLS connections instead of
+    each opening their own.
+
+    A network can list fallback endpoints in <NETWORK>_RPC_URLS (comma
+    separated, e.g. BASE_SEPOLIA_RPC_URLS); reads are then routed by latency
+    across them and <NETWORK>_RPC_URL, which stays the primary for writes.
+
+    Note: web3.py is designed around one long-lived provider per endpoint
+    (providers cache their session, middleware and request counters), so
+    the instance stored per URL here is the only one handed out, and it is
+    never rebuilt or pointed at a different endpoint after creation.
+    """
+
+    # Network name -> (RPC URL env var, default URL)
+    RPC_URL_ENV = {
+        'local': ('LOCAL_RPC_URL', 'http://127.0.0.1:8545'),
+        'sepolia': ('SEPOLIA_RPC_URL', None),
+        'base-sepolia': ('BASE_SEPOLIA_RPC_URL', None),
+        'optimism-sepolia': ('OPTIMISM_SEPOLIA_RPC_URL', None)
+    }
+
+    # Per-request timeout in seconds; receipt waits poll, so no single call needs long
+    REQUEST_TIMEOUT = 10
+
+    def __init__(self):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=self._retry_policy())
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._instances: Dict[str, Web3] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _retry_policy() -> Retry:
+        """
+        Retry policy for rate limits and gateway errors from RPC providers
+
+        JSON-RPC goes over POST, which urllib3 does not retry by default. A
+        retried eth_sendRawTransaction re-sends the same signed payload, which
+        the node rejects as already known if the first attempt reached it;
+        send_raw_transaction turns that rejection back into the transaction hash.
+        """
+        return Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False
+        )
+
+    def rpc_url(self, network: str) -> Optional[str]:
+        """RPC URL configured for a network, or None if it isn't set"""
+        env_var, default = self.RPC_URL_ENV.get(network, (f"{network.upper().replace('-', '_')}_RPC_URL", None))
+        return os.getenv(env_var, default)
+
+    def rpc_urls(self, network: str) -> List[str]:
+        """All RPC URLs configured for a network, primary first"""
+        env_var, _ = self.RPC_URL_ENV.get(network, (f"{network.upper().replace('-', '_')}_RPC_URL", None))
+        urls = [self.rpc_url(network)] + os.getenv(f"{env_var}S", "").split(",")
+        return list(dict.fromkeys(url.strip() for url in urls if url and url.strip()))
+
+    def ws_url(self, network: str) -> Optional[str]:
+        """WebSocket URL configured for a network (<NETWORK>_WS_URL), or None"""
+        env_var, _ = self.RPC_URL_ENV.get(network, (f"{network.upper().replace('-', '_')}_RPC_URL", None))
+        return os.getenv(env_var.replace('_RPC_URL', '_WS_URL'))
+
+    def get(self, network: str) -> Web3:
+        """
+        Get the shared Web3 instance for a network
+
+        Raises:
+            ValueError: If no RPC URL is configured for the network
+        """
+        rpc_urls = self.rpc_urls(network)
+        if not rpc_urls:
+            raise ValueError(f"RPC URL not configured for network: {network}")
+        return self.get_urls(rpc_urls)
+
+    def get_url(self, rpc_url: str) -> Web3:
+        """Get the shared Web3 instance for an RPC URL"""
+        return self.get_urls([rpc_url])
+
+    def get_urls(self, rpc_urls: List[str]) -> Web3:
+        """Get the shared Web3 instance for a set of RPC URLs, the first being the primary"""
+        key = ",".join(rpc_urls)
+        w3 = self._instances.get(key)
+        if w3 is None:
+            # Built outside the lock: the routed provider's startup probes can take
+            # a timeout per endpoint. If two threads race, the first stored instance wins.
+            endpoints = [self._http_provider(rpc_url) for rpc_url in rpc_urls]
+            provider = endpoints[0] if len(endpoints) == 1 else _LatencyRoutedProvider(endpoints)
+            with self._lock:
+                w3 = self._instances.setdefault(key, Web3(provider))
+        return w3
+
+    def _http_provider(self, rpc_url: str):
+        return Web3.HTTPProvider(
+            rpc_url,
+            session=self.session,
+            request_kwargs={'timeout': self.REQUEST_TIMEOUT}
+        )
+
+
+# Module singleton
+providers = _ProviderRegistry()
+
+
+class _GasPriceCache:
+    """
+    Short-lived eth_gasPrice cache
+
+    Gas price barely moves within a burst of writes (register, authorize,
+    request within a few seconds), so a value younger than ttl seconds is
+    reused instead of asking the node again.
+    """
+
+    def __init__(self, ttl: float = 2.0):
+        self.ttl = ttl
+        self._entry: Optional[Tuple[float, Any]] = None  # (timestamp, gas price or fee pair)
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        """Return the cached gas price if it is still fresh"""
+        with self._lock:
+            if self._entry is not None and time.monotonic() - self._entry[0] < self.ttl:
+                return self._entry[1]
+        return None
+
+    def set(self, gas_price: Any) -> None:
+        """Record a freshly fetched gas price"""
+        with self._lock:
+            self._entry = (time.monotonic(), gas_price)
+
+
+# One gas price cache per Web3 instance (i.e. per RPC URL)
+_GAS_PRICE_CACHES: Dict[int, _GasPriceCache] = {}
+
+
+def _gas_price_cache(w3: Web3) -> _GasPriceCache:
+    """Get the gas price cache for a Web3 instance"""
+    cache = _GAS_PRICE_CACHES.get(id(w3))
+    if cache is None:
+        cache = _GAS_PRICE_CACHES.setdefault(id(w3), _GasPriceCache())
+    return cache
+
+
+# One EIP-1559 fee cache per Web3 instance, holding (max_fee, max_priority_fee)
+_FEE_CACHES: Dict[int, _GasPriceCache] = {}
+
+# Floor for the predicted priority fee (0.1 gwei), so quiet blocks don't yield a zero tip
+MIN_PRIORITY_FEE = 10**8
+
+
+def fetch_eip1559_fees(w3: Web3) -> Optional[Tuple[int, int]]:
+    """
+    Predict EIP-1559 fees from the last few blocks' fee history
+
+    The priority fee is the median of the blocks' 50th percentile tips
+    (at least MIN_PRIORITY_FEE), and the max fee allows the base fee to
+    double before the transaction is priced out. Like the gas price, the
+    prediction is reused for a couple of seconds.
+
+    Args:
+        w3: Web3 instance to query
+
+    Returns:
+        Tuple of (max_fee_per_gas, max_priority_fee_per_gas), or None if the
+        chain does not report a base fee (pre-London); use gasPrice then
+    """
+    cache = _FEE_CACHES.get(id(w3))
+    if cache is None:
+        cache = _FEE_CACHES.setdefault(id(w3), _GasPriceCache())
+    fees = cache.get()
+    if fees is not None:
+        return fees
+
+    try:
+        fee_history = w3.eth.fee_history(5, 'latest', [50])
+        base_fee = fee_history['baseFeePerGas'][-1]
+    except Exception:
+        return None
+    rewards = sorted(reward[0] for reward in fee_history.get('reward') or [] if reward)
+    priority_fee = max(rewards[len(rewards) // 2] if rewards else 0, MIN_PRIORITY_FEE)
+    fees = (2 * base_fee + priority_fee, priority_fee)
+    cache.set(fees)
+    return fees
+
+
+# Canonical Multicall3, deployed at the same address on every chain we target
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+MULTICALL3_ABI = [
+    {
+        "name": "aggregate3",
+        "type": "function",
+        "stateMutability": "payable",
+        "inputs": [{
+            "name": "calls",
+            "type": "tuple[]",
+            "components": [
+                {"name": "target", "type": "address"},
+                {"name": "allowFailure", "type": "bool"},
+                {"name": "callData", "type": "bytes"}
+            ]
+        }],
+        "outputs": [{
+            "name": "returnData",
+            "type": "tuple[]",
+            "components": [
+                {"name": "success", "type": "bool"},
+                {"name": "returnData", "type": "bytes"}
+            ]
+        }]
+    },
+    {
+        "name": "getEthBalance",
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [{"name": "addr", "type": "address"}],
+        "outputs": [{"name": "balance", "type": "uint256"}]
+    }
+]
+
+
+def get_web3(rpc_url: str) -> Web3:
+    """
+    Get the shared Web3 instance for an RPC URL
+
+    Args:
+        rpc_url: HTTP(S) RPC endpoint
+
+    Returns:
+        Web3 instance backed by the shared connection-pooled session
+    """
+    return providers.get_url(rpc_url)
+
+
+# Name of the signed payload attribute, resolved once for the installed eth-account
+# (rawTransaction before 0.13, raw_transaction after)
+RAW_TX_ATTR = 'raw_transaction' if hasattr(SignedTransaction, 'raw_transaction') else 'rawTransaction'
+
+
+def raw_transaction(signed_txn) -> bytes:
+    """Get the raw bytes of a signed transaction across eth-account versions"""
+    return getattr(signed_txn, RAW_TX_ATTR)
+
+
+# Node errors for a transaction that is already in its pool (geth, erigon/nethermind, besu)
+_KNOWN_TX_ERRORS = ("already known", "known transaction", "already imported")
+
+# Node errors for a nonce that an earlier transaction has taken
+_NONCE_ERRORS = ("nonce too low", "replacement transaction underpriced", "nonce has already been used")
+
+
+def is_nonce_error(error: Exception) -> bool:
+    """Whether a send failed because its nonce is already taken (safe to rebuild at a fresh nonce)"""
+    message = str(error).lower()
+    return any(fragment in message for fragment in _NONCE_ERRORS)
+
+
+def is_transaction_known(w3: Web3, tx_hash) -> bool:
+    """Whether the node has a transaction, pending or mined"""
+    try:
+        return w3.eth.get_transaction(tx_hash) is not None
+    except TransactionNotFound:
+        return False
+
+
+def send_raw_transaction(w3: Web3, raw_tx: bytes):
+    """
+    Broadcast a signed transaction, treating a copy the node already has as sent
+
+    Gateway errors are retried at the HTTP level (see _ProviderRegistry._retry_policy),
+    so a broadcast the node accepted can reach it twice. The node then rejects the
+    copy as already known, or as nonce too low once the original is mined. Both
+    mean the signed transaction itself is on its way, so its hash is returned.
+
+    Args:
+        w3: Web3 instance to broadcast through
+        raw_tx: Signed transaction bytes
+
+    Returns:
+        Transaction hash
+
+    Raises:
+        Exception: The node's error, if it did not accept this transaction
+    """
+    try:
+        return w3.eth.send_raw_transaction(raw_tx)
+    except Exception as e:
+        tx_hash = Web3.keccak(raw_tx)
+        message = str(e).lower()
+        if any(fragment in message for fragment in _KNOWN_TX_ERRORS):
+            return tx_hash
+        if is_nonce_error(e) and is_transaction_known(w3, tx_hash):
+            return tx_hash
+        raise
+
+
+@lru_cache(maxsize=None)
+def to_checksum_address(address: str) -> str:
+    """Checksum an address, caching the keccak work for repeated addresses"""
+    return Web3.to_checksum_address(address)
+
+
+@lru_cache(maxsize=None)
+def load_contract_abi(abi_path: str) -> tuple:
+    """
+    Load a contract ABI from a compiled Foundry artifact
+
+    Artifacts don't change during a run, so each file is read and parsed once
+    per process no matter how many agents are constructed.
+
+    Args:
+        abi_path: Path to the artifact JSON (contracts/out/<Name>.sol/<Name>.json)
+
+    Returns:
+        The ABI as a tuple of entries
+    """
+    with open(abi_path, 'r') as f:
+        return tuple(json.load(f)['abi'])
+
+
+# Repository root, against which deployment files are resolved
+_REPO_ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+# Network name -> deployment file, relative to the repository root
+DEPLOYMENT_FILES = {
+    'local': 'deployment.json',
+    'sepolia': 'deployments/sepolia.json',
+    'base-sepolia': 'deployments/base-sepolia.json',
+    'optimism-sepolia': 'deployments/optimism-sepolia.json'
+}
+
+
+# Local cache of resolved agent IDs, one JSON file per agent domain
+AGENT_CACHE_DIR = os.path.join(_REPO_ROOT, '.cache')
+
+
+def _agent_cache_path(agent_domain: str) -> str:
+    """Cache file for an agent domain"""
+    return os.path.join(AGENT_CACHE_DIR, f"agent_{agent_domain}.json")
+
+
+def load_cached_agent_id(agent_domain: str, address: str, network: str, registry_address: str) -> Optional[int]:
+    """
+    Read a previously resolved agent ID from the local cache
+
+    The entry is only trusted if it was written for the same address,
+    network and IdentityRegistry deployment; a redeployed registry assigns
+    new IDs, so its address is part of the key.
+
+    Returns:
+        The cached agent ID, or None if there is no matching entry
+    """
+    try:
+        with open(_agent_cache_path(agent_domain), 'r') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (entry.get('address', '').lower() == address.lower()
+            and entry.get('network') == network
+            and entry.get('identity_registry', '').lower() == registry_address.lower()):
+        return entry.get('agent_id')
+    return None
+
+
+def store_cached_agent_id(agent_domain: str, address: str, network: str, registry_address: str, agent_id: int):
+    """Atomically record a resolved agent ID in the local cache (best effort)"""
+    path = _agent_cache_path(agent_domain)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(AGENT_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'agent_id': agent_id,
+                'address': address,
+                'network': network,
+                'identity_registry': registry_address
+            }, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def deployment_path(network: str) -> str:
+    """Path of the deployment file for a network"""
+    return os.path.join(_REPO_ROOT, DEPLOYMENT_FILES.get(network, f'deployments/{network}.json'))
+
+
+@lru_cache(maxsize=None)
+def load_network_deployment(network: str) -> Dict[str, Any]:
+    """
+    Load the deployment file for a network, once per process
+
+    The returned dict is shared between callers and must not be mutated.
+
+    Raises:
+        FileNotFoundError: If the network's deployment file does not exist
+    """
+    return load_deployment(deployment_path(network))
+
+
+@lru_cache(maxsize=None)
+def load_deployment(deployment_path: str) -> Dict[str, Any]:
+    """
+    Load a deployment file, parsing each path once per process
+
+    The returned dict is shared between callers and must not be mutated.
+    """
+    with open(deployment_path, 'r') as f:
+        return json.load(f)
+
+
+def _abi_type(param: Dict[str, Any]) -> str:
+    """Render an ABI parameter as a canonical type string, expanding tuples"""
+    abi_type = param['type']
+    if abi_type.startswith('tuple'):
+        components = ','.join(_abi_type(c) for c in param['components'])
+        return f"({components}){abi_type[len('tuple'):]}"
+    return abi_type
+
+
+def _output_types(contract_call) -> List[str]:
+    """Output type strings for a bound contract function"""
+    return [_abi_type(o) for o in contract_call.abi['outputs']]
+
+
+def multicall(w3: Web3, contract_calls: Sequence, multicall_address: str = MULTICALL3_ADDRESS,
+              individual_fallback: bool = True) -> List[Any]:
+    """
+    Execute several read-only contract calls in a single eth_call
+
+    The calls are packed into one Multicall3.aggregate3 request and each
+    result is decoded with its own function's output types. Calls that
+    revert yield None. If Multicall3 is not deployed on the connected chain
+    (e.g. a fresh anvil node), the calls are issued individually on the
+    shared thread pool instead.
+
+    Args:
+        w3: Web3 instance to query
+        contract_calls: Bound contract functions, e.g. registry.functions.getAgent(1)
+        multicall_address: Multicall3 deployment to aggregate through
+        individual_fallback: Issue the calls individually if the aggregate
+            fails; when False, every result is None instead
+
+    Returns:
+        One decoded result per call, in order (single outputs are unwrapped)
+    """
+    if not contract_calls:
+        return []
+
+    def _unwrap(values):
+        return values[0] if len(values) == 1 else values
+
+    try:
+        multicall3 = w3.eth.contract(address=to_checksum_address(multicall_address), abi=MULTICALL3_ABI)
+        results = multicall3.functions.aggregate3([
+            (call.address, True, call._encode_transaction_data())
+            for call in contract_calls
+        ]).call()
+    except Exception:
+        if not individual_fallback:
+            return [None] * len(contract_calls)
+        futures = [_RPC_EXECUTOR.submit(_call_or_none, call) for call in contract_calls]
+        return [future.result() for future in futures]
+
+    decoded = []
+    for call, (success, return_data) in zip(contract_calls, results):
+        if not success or not return_data:
+            decoded.append(None)
+            continue
+        decoded.append(_unwrap(w3.codec.decode(_output_types(call), return_data)))
+    return decoded
+
+
+def get_eth_balances(w3: Web3, addresses: Sequence[str],
+                     multicall_address: str = MULTICALL3_ADDRESS) -> List[int]:
+    """
+    Get the ETH balance (in wei) of several addresses in a single eth_call
+
+    Balances are read through Multicall3.getEthBalance, so N wallets cost one
+    request instead of N eth_getBalance calls. Where Multicall3 is missing
+    (e.g. a local node), or for any balance the aggregate could not return,
+    eth_getBalance calls are fanned out concurrently on the shared thread pool.
+
+    Args:
+        w3: Web3 instance to query
+        addresses: Addresses to read
+        multicall_address: Multicall3 deployment to aggregate through
+
+    Returns:
+        One balance in wei per address, in order
+    """
+    balances, _ = get_eth_balances_with_reads(w3, addresses, (), multicall_address)
+    return balances
+
+
+def get_eth_balances_with_reads(w3: Web3, addresses: Sequence[str], reads: Sequence[Any],
+                                multicall_address: str = MULTICALL3_ADDRESS) -> Tuple[List[int], List[Any]]:
+    """
+    get_eth_balances, plus read-only contract calls aggregated into the same eth_call
+
+    Useful for token balances (e.g. USDC balanceOf for the same wallets)
+    shown next to the ETH balances. Reads the aggregate could not return
+    are retried individually; ones that still revert yield None.
+
+    Args:
+        w3: Web3 instance to query
+        addresses: Addresses to read ETH balances for
+        reads: Bound contract functions (not yet .call()ed) to evaluate
+        multicall_address: Multicall3 deployment to aggregate through
+
+    Returns:
+        Tuple of (balances in wei, read_results), each in input order
+    """
+    multicall3 = w3.eth.contract(address=to_checksum_address(multicall_address), abi=MULTICALL3_ABI)
+    calls = [multicall3.functions.getEthBalance(to_checksum_address(a)) for a in addresses] + list(reads)
+    results = multicall(w3, calls, multicall_address, individual_fallback=False)
+    balances, read_results = results[:len(addresses)], results[len(addresses):]
+
+    missing_balances = {i: _RPC_EXECUTOR.submit(w3.eth.get_balance, addresses[i])
+                        for i, balance in enumerate(balances) if balance is None}
+    missing_reads = {i: _RPC_EXECUTOR.submit(_call_or_none, reads[i])
+                     for i, result in enumerate(read_results) if result is None}
+    for i, future in missing_balances.items():
+        balances[i] = future.result()
+    for i, future in missing_reads.items():
+        read_results[i] = future.result()
+    return balances, read_results
+
+
+def _call_or_none(contract_call) -> Any:
+    """Call a read-only contract function, returning None if it reverts"""
+    try:
+        return contract_call.call()
+    except Exception:
+        return None
+
+
+# keccak("AgentRegistered(uint256,string,address)"), the IdentityRegistry registration event
+AGENT_REGISTERED_TOPIC = Web3.keccak(text="AgentRegistered(uint256,string,address)")
+
+
+def agent_id_from_receipt(agent_registered_event, receipt) -> Optional[int]:
+    """
+    Decode the registered agent ID from a receipt's AgentRegistered log
+
+    Logs are matched on emitting contract and topic0 first, so only the
+    registration log is handed to the ABI decoder instead of every log in
+    the receipt.
+
+    Args:
+        agent_registered_event: Prebuilt identity_registry.events.AgentRegistered() instance
+        receipt: Receipt of the newAgent transaction
+
+    Returns:
+        The agent ID, or None if the receipt has no AgentRegistered log
+    """
+    registry_address = agent_registered_event.address.lower()
+    for log in receipt['logs']:
+        topics = log['topics']
+        if topics and bytes(topics[0]) == AGENT_REGISTERED_TOPIC and log['address'].lower() == registry_address:
+            return agent_registered_event.process_log(log)['args']['agentId']
+    return None
+
+
+def lookup_registered_agent_id(identity_registry, address: str, block_hash) -> Optional[int]:
+    """
+    Find the agent ID assigned to an address, for when receipt parsing failed
+
+    eth_getLogs for AgentRegistered in the mined block and a resolveByAddress
+    eth_call are sent together in one JSON-RPC batch (or concurrently when
+    batching is unavailable); whichever yields a valid ID is used.
+
+    Args:
+        identity_registry: IdentityRegistry contract instance
+        address: Address the agent was registered with
+        block_hash: Hash of the block the registration was mined in
+
+    Returns:
+        The agent ID, or None if neither lookup found it
+    """
+    w3 = identity_registry.w3
+    log_filter = {
+        'address': identity_registry.address,
+        'blockHash': block_hash,
+        'topics': [AGENT_REGISTERED_TOPIC]
+    }
+    resolve_call = identity_registry.functions.resolveByAddress(address)
+
+    logs = resolved = None
+    batched = False
+    if hasattr(w3, 'batch_requests'):
+        try:
+            with w3.batch_requests() as batch:
+                batch.add(w3.eth.get_logs(log_filter))
+                batch.add(resolve_call)
+                logs, resolved = batch.execute()
+            batched = True
+        except Exception:
+            pass
+
+    if not batched:
+        def _get_logs():
+            try:
+                return w3.eth.get_logs(log_filter)
+            except Exception:
+                return None
+
+        logs_future = _RPC_EXECUTOR.submit(_get_logs)
+        resolved_future = _RPC_EXECUTOR.submit(_call_or_none, resolve_call)
+        logs, resolved = logs_future.result(), resolved_future.result()
+
+    event = identity_registry.events.AgentRegistered()
+    for log in logs or []:
+        try:
+            args = event.process_log(log)['args']
+        except Exception:
+            continue
+        if args['agentAddress'].lower() == address.lower():
+            return args['agentId']
+
+    if resolved and resolved[0] > 0:
+        return resolved[0]
+    return None
+
+
+def fetch_tx_params(w3: Web3, address: str, contract_call=None,
+                    nonce: Optional[int] = None) -> Tuple[int, int, Optional[int]]:
+    """
+    Fetch gas price, nonce and (optionally) a gas estimate in one round trip
+
+    The reads are sent as a single JSON-RPC batch when the installed web3.py
+    supports it. Otherwise they are issued concurrently on a thread pool,
+    since they have no data dependency on each other. The gas price is
+    served from a 2 second cache when fresh, and the nonce is read against
+    the pending block so it accounts for transactions not yet mined.
+
+    Args:
+        w3: Web3 instance to query
+        address: Sender address
+        contract_call: Optional contract function to estimate gas for
+        nonce: Locally tracked nonce; when given, eth_getTransactionCount is skipped
+
+    Returns:
+        Tuple of (gas_price, nonce, gas_estimate); gas_estimate is None when
+        no contract call is given
+    """
+    gas_price, nonce, gas_estimate, _ = fetch_tx_params_with_reads(w3, address, contract_call, nonce)
+    return gas_price, nonce, gas_estimate
+
+
+def fetch_tx_params_with_reads(w3: Web3, address: str, contract_call=None, nonce: Optional[int] = None,
+                               reads: Sequence[Any] = (),
+                               legacy_gas_price: bool = True) -> Tuple[Optional[int], int, Optional[int], List[Any]]:
+    """
+    fetch_tx_params, plus read-only contract calls issued in the same round trip
+
+    Useful for pre-flight checks (e.g. a token balance) that would otherwise
+    cost their own round trip before the transaction is built.
+
+    Args:
+        w3: Web3 instance to query
+        address: Sender address
+        contract_call: Optional contract function to estimate gas for
+        nonce: Locally tracked nonce; when given, eth_getTransactionCount is skipped
+        reads: Bound contract functions (not yet .call()ed) to evaluate
+        legacy_gas_price: Fetch the legacy gas price; pass False when the transaction
+            is priced with EIP-1559 fees instead (gas_price is then None)
+
+    Returns:
+        Tuple of (gas_price, nonce, gas_estimate, read_results), with
+        read_results in the same order as reads
+    """
+    gas_price_cache = _gas_price_cache(w3)
+    gas_price = gas_price_cache.get() if legacy_gas_price else None
+    fetch_gas_price = legacy_gas_price and gas_price is None
+    fetch_nonce = nonce is None
+
+    if not (fetch_gas_price or fetch_nonce or contract_call is not None or reads):
+        return gas_price, nonce, None, []
+
+    if hasattr(w3, 'batch_requests'):
+        try:
+            with w3.batch_requests() as batch:
+                if fetch_gas_price:
+                    batch.add(w3.eth.gas_price)
+                if fetch_nonce:
+                    batch.add(w3.eth.get_transaction_count(address, 'pending'))
+                if contract_call is not None:
+                    batch.add(contract_call.estimate_gas({'from': address}))
+                for read in reads:
+                    batch.add(read)
+                results = list(batch.execute())
+
+            if fetch_gas_price:
+                gas_price = results.pop(0)
+                gas_price_cache.set(gas_price)
+            if fetch_nonce:
+                nonce = results.pop(0)
+            gas_estimate = results.pop(0) if contract_call is not None else None
+            return gas_price, nonce, gas_estimate, results
+        except Exception:
+            # Provider rejected the batch (or one of its calls failed);
+            # retry unbatched so the real error surfaces below
+            pass
+
+    gas_price_future = _RPC_EXECUTOR.submit(lambda: w3.eth.gas_price) if fetch_gas_price else None
+    nonce_future = _RPC_EXECUTOR.submit(w3.eth.get_transaction_count, address, 'pending') if fetch_nonce else None
+    gas_future = None
+    if contract_call is not None:
+        gas_future = _RPC_EXECUTOR.submit(contract_call.estimate_gas, {'from': address})
+    read_futures = [_RPC_EXECUTOR.submit(read.call) for read in reads]
+
+    read_results = [future.result() for future in read_futures]
+    gas_estimate = gas_future.result() if gas_future is not None else None
+    if gas_price_future is not None:
+        gas_price = gas_price_future.result()
+        gas_price_cache.set(gas_price)
+    if nonce_future is not None:
+        nonce = nonce_future.result()
+    return gas_price, nonce, gas_estimate, read_results
+
+
+def wait_for_receipt(w3: Web3, tx_hash, ws_url: Optional[str] = None, timeout: float = 120,
+                     poll_latency: float = 0.5) -> Any:
+    """
+    Wait for a transaction receipt
+
+    When a WebSocket endpoint is configured, the receipt is looked up once per
+    new block announced by an eth_subscribe("newHeads") subscription instead
+    of polling on a fixed interval. The receipt itself is always fetched over
+    HTTP: the socket only carries the subscription, since concurrent unicast
+    requests over one WebSocket serialize behind each other.
+
+    Args:
+        w3: HTTP Web3 instance used for the receipt lookups
+        tx_hash: Hash of the transaction to wait for
+        ws_url: Optional WebSocket RPC URL for the newHeads subscription
+        timeout: Seconds to wait before giving up
+        poll_latency: Seconds between receipt polls when falling back to HTTP
+            (web3.py polls every 0.1s by default, far faster than blocks arrive)
+
+    Returns:
+        The transaction receipt
+    """
+    if ws_url:
+        try:
+            return asyncio.run(_wait_for_receipt_ws(w3, tx_hash, ws_url, timeout))
+        except TimeExhausted:
+            raise
+        except Exception:
+            # No WebSocket support in this web3.py, endpoint unreachable, or
+            # already inside an event loop: fall back to HTTP polling
+            pass
+
+    return w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout, poll_latency=poll_latency)
+
+
+def _get_receipt_or_none(w3: Web3, tx_hash) -> Any:
+    """Return the receipt for tx_hash, or None if it is not mined yet"""
+    try:
+        return w3.eth.get_transaction_receipt(tx_hash)
+    except TransactionNotFound:
+        return None
+
+
+async def _wait_for_receipt_ws(w3: Web3, tx_hash, ws_url: str, timeout: float) -> Any:
+    """Wait for a receipt, checking once per newHeads notification"""
+    from web3 import AsyncWeb3, WebSocketProvider
+
+    async def _wait() -> Any:
+        async with AsyncWeb3(WebSocketProvider(ws_url)) as ws_w3:
+            await ws_w3.eth.subscribe("newHeads")
+
+            # The transaction may already be mined before the subscription
+            receipt = await asyncio.to_thread(_get_receipt_or_none, w3, tx_hash)
+            if receipt is not None:
+                return receipt
+
+            async for _ in ws_w3.socket.process_subscriptions():
+                receipt = await asyncio.to_thread(_get_receipt_or_none, w3, tx_hash)
+                if receipt is not None:
+                    return receipt
+
+        raise ConnectionError("WebSocket subscription closed before the receipt arrived")
+
+    try:
+        return await asyncio.wait_for(_wait(), timeout)
+    except asyncio.TimeoutError:
+        raise TimeExhausted(f"Transaction {tx_hash!r} is not in the chain after {timeout} seconds")
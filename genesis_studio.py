@@ -259,10 +259,23 @@ class GenesisStudioX402Orchestrator:
         """Register all agents on the ERC-8004 IdentityRegistry"""
         
         registration_results = {}
+        agents = [("Alice", self.alice_sdk), ("Bob", self.bob_sdk), ("Charlie", self.charlie_sdk)]
+        
+        # Broadcast every registration first: each agent has its own nonce, so
+        # the transactions are independent and get mined in the same block
+        pending = {}
+        for agent_name, sdk in agents:
+            try:
+                pending[agent_name] = sdk.send_identity_registration()
+            except Exception as e:
+                self.cli.print_error(f"Failed to register {agent_name}", str(e))
+                registration_results[agent_name] = {"error": str(e)}
         
-        for agent_name, sdk in [("Alice", self.alice_sdk), ("Bob", self.bob_sdk), ("Charlie", self.charlie_sdk)]:
+        for agent_name, sdk in agents:
+            if agent_name not in pending:
+                continue
             try:
-                agent_id, tx_hash = sdk.register_identity()
+                agent_id, tx_hash = sdk.await_identity_registration(pending[agent_name])
                 self.cli.print_agent_registration(
                     agent_name, 
                     agent_id, 
@@ -473,7 +486,7 @@ class GenesisStudioX402Orchestrator:
                 "success": True,
                 "cid": cid,
                 "gateway_url": gateway_url,
-                "payment_proofs_included": len(evidence_package["payment_proofs"])
+                "payment_proofs_included": evidence_package["metadata"]["payment_proof_count"]
             }
         else:
             raise Exception("Failed to store enhanced evidence package on IPFS")
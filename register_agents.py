@@ -55,9 +55,8 @@ def main():
         wallet_manager.display_wallet_summary()
         
         # Check if wallets need funding
-        alice_balance = wallet_manager.get_wallet_balance("Alice", "eth")
-        bob_balance = wallet_manager.get_wallet_balance("Bob", "eth")
-        charlie_balance = wallet_manager.get_wallet_balance("Charlie", "eth")
+        balances = wallet_manager.get_wallet_balances(["Alice", "Bob", "Charlie"], "eth")
+        alice_balance, bob_balance, charlie_balance = balances["Alice"], balances["Bob"], balances["Charlie"]
         
         if alice_balance < 0.001 or bob_balance < 0.001 or charlie_balance < 0.001:
             cli.print_warning("⚠️  Some wallets have low ETH balance!")
@@ -105,15 +104,26 @@ def main():
         cli.print_step(5, "Registering agents on ERC-8004 IdentityRegistry", "in_progress")
         registration_results = {}
         
+        # Send all registrations before waiting on any, so they confirm together
+        pending = {}
         for name, agent in agents.items():
             try:
-                if agent.agent_id:
+                tx_hash = agent.build_and_send_registration()
+                if tx_hash is None:
                     print(f"✅ {name} already registered with Agent ID: {agent.agent_id}")
                     registration_results[name] = {"agent_id": agent.agent_id, "status": "already_registered"}
                 else:
-                    agent_id, tx_hash = agent.register_agent()
-                    cli.print_agent_registration(name, agent_id, agent.address, tx_hash)
-                    registration_results[name] = {"agent_id": agent_id, "tx_hash": tx_hash, "status": "newly_registered"}
+                    pending[name] = tx_hash
+            except Exception as e:
+                cli.print_error(f"Failed to register {name}", str(e))
+                registration_results[name] = {"error": str(e), "status": "failed"}
+        
+        for name, tx_hash in pending.items():
+            agent = agents[name]
+            try:
+                agent_id, tx_hash = agent.await_registration(tx_hash)
+                cli.print_agent_registration(name, agent_id, agent.address, tx_hash)
+                registration_results[name] = {"agent_id": agent_id, "tx_hash": tx_hash, "status": "newly_registered"}
             except Exception as e:
                 cli.print_error(f"Failed to register {name}", str(e))
                 registration_results[name] = {"error": str(e), "status": "failed"}
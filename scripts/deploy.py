@@ -20,6 +20,9 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Canonical Multicall3 address (same on every EVM chain it is deployed to)
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
 def load_contract_abi(contract_name: str) -> dict:
     """Load contract ABI from compiled artifacts"""
     abi_path = Path(f"contracts/out/{contract_name}.sol/{contract_name}.json")
@@ -90,7 +93,11 @@ def deploy_contract(w3: Web3, account, contract_name: str, constructor_args=None
 def save_deployment_info(addresses: dict, tx_hashes: dict):
     """Save deployment information to files"""
     deployment_info = {
-        'contracts': addresses,
+        'contracts': {
+            **addresses,
+            # Canonical Multicall3 (pre-deployed on all supported chains), used for bulk registry reads
+            'multicall3': MULTICALL3_ADDRESS
+        },
         'transactions': tx_hashes,
         'network': {
             'chain_id': int(os.getenv('CHAIN_ID', 31337)),